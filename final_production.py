@@ -1,15 +1,33 @@
 import os
+import re
+import atexit
+import asyncio
 import requests
 import json
 import time
 import logging
 import sqlite3
+import hashlib
+import zlib
+import inspect
+import functools
+import threading
+import queue
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
-from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Union, Callable, Iterator, AsyncIterator
+from dataclasses import dataclass, field
+from collections import namedtuple
 from enum import Enum
-import arxiv
 import feedparser
+import orjson
+import numpy as np
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib3.exceptions import MaxRetryError, ResponseError
+import aiohttp
 
 # Load environment variables
 from dotenv import load_dotenv
@@ -17,18 +35,55 @@ load_dotenv()
 
 # Google Gemini
 import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
+
+# uvloop, where installed, gives each workflow's event loop a faster I/O core
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+USER_AGENT = 'AI-Research-Ecosystem/1.0'
+
+def _run_async(coro):
+    """Run a coroutine to completion on a fresh event loop (uvloop when installed)"""
+    if uvloop is not None:
+        return uvloop.run(coro)
+    return asyncio.run(coro)
+
+# retry policy for data source calls: GitHub answers secondary rate limits with 403
+RETRY_TOTAL = 3
+RETRY_BACKOFF = 0.5
+RETRY_STATUSES = (403, 429, 502, 503)
+# a longer Retry-After would stall the workflow, so give up and serve the cached copy instead
+RETRY_AFTER_MAX = 10
+DB_PATH = 'ecosystem_data.db'
+
+# persistent cache of data source responses, keyed by (source, query, params)
+API_CACHE_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS api_cache (
+        source TEXT,
+        query TEXT,
+        params_hash TEXT,
+        payload BLOB,
+        fetched_at TIMESTAMP,
+        etag TEXT,
+        PRIMARY KEY (source, query, params_hash)
+    );
+    CREATE INDEX IF NOT EXISTS idx_api_cache_source_query ON api_cache(source, query);
+'''
+
 class AgentRole(Enum):
     RESEARCH = "research"
     ANALYSIS = "analysis"
     INNOVATION = "innovation"
     ENVIRONMENT = "environment"
 
-@dataclass
+@dataclass(slots=True)
 class ResearchTask:
     id: str
     title: str
@@ -44,34 +99,267 @@ class ResearchTask:
         if self.results is None:
             self.results = {}
 
+_MISSING = object()
+
+@dataclass(slots=True)
+class AgentResult:
+    """Output of one agent stage; payload holds the stage-specific fields"""
+    agent_id: str
+    task_id: str
+    timestamp: str
+    processing_time: Optional[float] = None  # None when the stage failed
+    payload: Dict[str, Any] = field(default_factory=dict)
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """Dict-style lookup over the fixed fields and the payload"""
+        if key in self.payload:
+            return self.payload[key]
+        if key in ('agent_id', 'task_id', 'timestamp'):
+            return getattr(self, key)
+        if key == 'processing_time' and self.processing_time is not None:
+            return self.processing_time
+        return default
+    
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Flat dict in the shape results are stored and reported in"""
+        result = {'agent_id': self.agent_id, 'task_id': self.task_id, **self.payload, 'timestamp': self.timestamp}
+        if self.processing_time is not None:
+            result['processing_time'] = self.processing_time
+        return result
+
+class BoundedRetry(Retry):
+    """urllib3 Retry that stops, rather than sleeps, when Retry-After exceeds RETRY_AFTER_MAX"""
+    
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        if response is not None and (self.get_retry_after(response) or 0) > RETRY_AFTER_MAX:
+            # with raise_on_status=False the pool hands this response back to the caller
+            raise MaxRetryError(_pool, url, ResponseError(f"Retry-After exceeds {RETRY_AFTER_MAX}s"))
+        return super().increment(method, url, response, error, _pool, _stacktrace)
+
+def create_http_session() -> requests.Session:
+    """Create a pooled HTTP session shared by all data source calls"""
+    session = requests.Session()
+    
+    # keep-alive pool so repeat calls to the same host skip the TCP/TLS handshake
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=20,
+        max_retries=BoundedRetry(
+            total=RETRY_TOTAL,
+            backoff_factor=RETRY_BACKOFF,
+            status_forcelist=RETRY_STATUSES,
+            respect_retry_after_header=True,
+            raise_on_status=False  # hand the last response back instead of raising
+        )
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    
+    session.headers.update({'User-Agent': USER_AGENT})
+    
+    return session
+
+# search terms per topic keyword, in priority order: the first rule with a keyword in the task text wins
+SEARCH_TERM_RULES = [
+    (('healthcare', 'medical'), ['artificial intelligence healthcare', 'machine learning medicine', 'AI diagnosis']),
+    (('ai', 'artificial intelligence'), ['artificial intelligence', 'machine learning', 'deep learning']),
+    (('generative', 'gpt'), ['generative ai', 'gpt', 'transformer models']),
+    (('blockchain', 'crypto'), ['blockchain technology', 'cryptocurrency', 'decentralized finance']),
+    (('sustainability', 'climate'), ['sustainability technology', 'climate change AI', 'green technology']),
+    (('robotics', 'automation'), ['robotics technology', 'automation systems', 'AI robotics']),
+    (('finance', 'investment'), ['financial technology', 'investment strategies', 'AI in finance']),
+    (('education', 'learning'), ['educational technology', 'AI in education', 'personalized learning']),
+    (('energy', 'renewable'), ['renewable energy technology', 'solar power AI', 'wind energy systems']),
+    (('cybersecurity', 'security'), ['cybersecurity AI', 'threat detection', 'security automation']),
+    (('transportation', 'mobility'), ['transportation technology', 'autonomous vehicles', 'smart mobility']),
+    (('agriculture', 'farming'), ['agricultural technology', 'precision farming AI', 'smart agriculture']),
+    (('entertainment', 'media'), ['entertainment technology', 'media AI', 'content creation tools']),
+    (('gaming', 'game'), ['gaming technology', 'game AI', 'interactive entertainment']),
+    (('smart home', 'iot'), ['smart home technology', 'IoT devices', 'home automation']),
+    (('supply chain', 'logistics'), ['supply chain technology', 'logistics AI', 'smart logistics']),
+    (('social media', 'communication'), ['social media technology', 'communication AI', 'digital marketing tools'])
+]
+_KEYWORD_RULE = {keyword: index for index, (keywords, _) in enumerate(SEARCH_TERM_RULES) for keyword in keywords}
+# one pass over the text; the zero-width lookahead also reports keywords that overlap each other
+# (e.g. 'ai' inside 'sustainability'), matching the substring checks this table replaces
+_KEYWORD_PATTERN = re.compile('(?=(' + '|'.join(map(re.escape, sorted(_KEYWORD_RULE, key=len, reverse=True))) + '))')
+
+# per-item weight and cap for (papers, news, github) in the data quality score:
+# academic papers (highest quality), recent news (medium quality), GitHub (practical relevance)
+_QUALITY_WEIGHTS = np.array([0.1, 0.05, 0.03])
+_QUALITY_CAPS = np.array([0.4, 0.3, 0.3])
+
+def source_counts(data: Dict[str, Any]) -> np.ndarray:
+    """(papers, news, github) item counts of a raw data dict"""
+    return np.array([len(data.get('papers', [])), len(data.get('news', [])), len(data.get('github', []))])
+
+def score_confidence_batch(counts: np.ndarray) -> np.ndarray:
+    """Confidence scores for an (n, 3) array of (papers, news, github) counts"""
+    sources = (counts > 0).sum(axis=1)
+    base_confidence = np.minimum(sources * 0.25, 0.75)  #max 0.75 from sources if we add more sources in the future
+    volume_bonus = np.minimum(counts.sum(axis=1) * 0.01, 0.25)  #the more items the higher the bonus
+    return (base_confidence + volume_bonus).clip(max=1.0)
+
+def score_data_quality_batch(counts: np.ndarray) -> np.ndarray:
+    """Data quality scores for an (n, 3) array of (papers, news, github) counts"""
+    return np.minimum(counts * _QUALITY_WEIGHTS, _QUALITY_CAPS).sum(axis=1).clip(max=1.0)
+
+# single-task scores depend only on the three counts, which the MAX_* caps keep to a handful of shapes
+
+@functools.lru_cache(maxsize=256)
+def confidence_for_counts(papers: int, news: int, github: int) -> float:
+    return float(score_confidence_batch(np.array([[papers, news, github]]))[0])
+
+@functools.lru_cache(maxsize=256)
+def data_quality_for_counts(papers: int, news: int, github: int) -> float:
+    return float(score_data_quality_batch(np.array([[papers, news, github]]))[0])
+
+_cache_conn = None
+_cache_lock = threading.Lock()
+
+CacheEntry = namedtuple('CacheEntry', ['payload', 'fetched_at', 'etag'])
+
+def _ensure_api_cache_schema(conn: sqlite3.Connection):
+    """Create the api_cache table, adding the etag column to tables from older versions"""
+    conn.executescript(API_CACHE_SCHEMA)
+    columns = [row[1] for row in conn.execute('PRAGMA table_info(api_cache)')]
+    if 'etag' not in columns:
+        conn.execute('ALTER TABLE api_cache ADD COLUMN etag TEXT')
+
+def _get_cache_conn() -> sqlite3.Connection:
+    """Open the shared cache connection on first use (call with _cache_lock held)"""
+    global _cache_conn
+    if _cache_conn is None:
+        conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+        _ensure_api_cache_schema(conn)
+        _cache_conn = conn
+    return _cache_conn
+
+def _params_hash(params: Dict[str, Any]) -> str:
+    return hashlib.blake2b(json.dumps(params, sort_keys=True).encode()).hexdigest()
+
+def _cache_get_entry(source: str, query: str, params_hash: str) -> Optional[CacheEntry]:
+    """Return the cached entry for a key regardless of age, or None"""
+    try:
+        with _cache_lock:
+            row = _get_cache_conn().execute(
+                'SELECT payload, fetched_at, etag FROM api_cache WHERE source = ? AND query = ? AND params_hash = ?',
+                (source, query, params_hash)
+            ).fetchone()
+        if row:
+            return CacheEntry(orjson.loads(zlib.decompress(row[0])), row[1], row[2])
+    except Exception as e:
+        logger.warning(f"API cache read error: {e}")
+    return None
+
+def _cache_get(source: str, query: str, params_hash: str, ttl: int) -> Optional[Any]:
+    """Return a cached payload younger than ttl seconds, or None"""
+    entry = _cache_get_entry(source, query, params_hash)
+    if entry and entry.fetched_at > time.time() - ttl:
+        return entry.payload
+    return None
+
+def _cache_put(source: str, query: str, params_hash: str, payload: Any, etag: Optional[str] = None):
+    """Store a payload (and the ETag it was served with) in the API cache"""
+    try:
+        blob = zlib.compress(orjson.dumps(payload))
+        with _cache_lock:
+            conn = _get_cache_conn()
+            with conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO api_cache (source, query, params_hash, payload, fetched_at, etag) VALUES (?, ?, ?, ?, ?, ?)',
+                    (source, query, params_hash, blob, time.time(), etag)
+                )
+    except Exception as e:
+        logger.warning(f"API cache write error: {e}")
+
+def _cache_touch(source: str, query: str, params_hash: str):
+    """Mark a cached payload as fresh again (after a 304 Not Modified)"""
+    try:
+        with _cache_lock:
+            conn = _get_cache_conn()
+            with conn:
+                conn.execute(
+                    'UPDATE api_cache SET fetched_at = ? WHERE source = ? AND query = ? AND params_hash = ?',
+                    (time.time(), source, query, params_hash)
+                )
+    except Exception as e:
+        logger.warning(f"API cache write error: {e}")
+
+def cached(source: str, ttl: int = 3600):
+    """Cache a DataAPIs search method in SQLite so repeated queries skip the network.
+    
+    The key is the method's `query` argument plus a hash of its other arguments
+    (the aiohttp session is ignored). Empty results are not cached, so a failed
+    request is retried on the next call.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        
+        def cache_key(args, kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            params = {name: value for name, value in bound.arguments.items() if name not in ('self', 'http')}
+            query = str(params.pop('query'))
+            return query, _params_hash(params)
+        
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                query, params_hash = cache_key(args, kwargs)
+                result = _cache_get(source, query, params_hash, ttl)
+                if result is None:
+                    result = await func(*args, **kwargs)
+                    if result:
+                        _cache_put(source, query, params_hash, result)
+                return result
+            return async_wrapper
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            query, params_hash = cache_key(args, kwargs)
+            result = _cache_get(source, query, params_hash, ttl)
+            if result is None:
+                result = func(*args, **kwargs)
+                if result:
+                    _cache_put(source, query, params_hash, result)
+            return result
+        return wrapper
+    return decorator
+
 class DataAPIs:
     """Integration with real data sources"""
     
-    def __init__(self):
+    ARXIV_API_URL = "https://export.arxiv.org/api/query"
+    GITHUB_SEARCH_URL = "https://api.github.com/search/repositories"  #GitHub API endpoint
+    
+    # Tech news RSS feeds
+    RSS_FEEDS = [
+        ("TechCrunch", "https://techcrunch.com/feed/"), # startups and technology news
+        ("BBC Technology", "https://feeds.bbci.co.uk/news/technology/rss.xml"), # focuses on technology news
+        ("Wired", "https://www.wired.com/feed/rss"),
+        ("AI News", "https://www.artificialintelligence-news.com/feed/")
+    ]
+    
+    def __init__(self, session: Optional[requests.Session] = None):
         self.serper_api_key = os.getenv('SERPER_API_KEY', '')
         self.news_api_key = os.getenv('NEWS_API_KEY', '')
         self.github_token = os.getenv('GITHUB_TOKEN', '')
+        self.session = session or create_http_session()
         
-    def search_arxiv_papers(self, query: str, max_results: int = 10) -> List[Dict]:
-        """Search arXiv for academic papers"""
+    @cached("arxiv", ttl=3600)
+    def search_arxiv_papers(self, query: Union[str, List[str]], max_results: int = 10) -> List[Dict]:
+        """Search arXiv for academic papers; a list of queries is OR-ed into one request"""
         try:
-            client = arxiv.Client()
-            search = arxiv.Search(
-                query=query,
-                max_results=max_results,
-                sort_by=arxiv.SortCriterion.SubmittedDate # newest first
-            )
-            
-            papers = []
-            for result in client.results(search):
-                papers.append({
-                    'title': result.title,
-                    'authors': [author.name for author in result.authors],
-                    'summary': result.summary[:500] + "...",
-                    'published': result.published.strftime('%Y-%m-%d'),
-                    'url': result.entry_id,
-                    'categories': result.categories
-                })
+            # one Atom request instead of the arxiv client's paginated generator
+            response = self.session.get(self.ARXIV_API_URL, params=self._arxiv_query(query, max_results), timeout=10)
+            papers = self._parse_arxiv_entries(feedparser.parse(response.content))
             
             logger.info(f"Retrieved {len(papers)} papers from arXiv")
             return papers
@@ -80,6 +368,36 @@ class DataAPIs:
             logger.error(f"arXiv search error: {e}")
             return []
     
+    def _arxiv_query(self, query: Union[str, List[str]], max_results: int) -> Dict[str, Any]:
+        """Build arXiv Atom API params for the newest papers matching query"""
+        if isinstance(query, str):
+            search_query = f'all:{query}'
+        else:
+            search_query = ' OR '.join(f'all:"{term}"' for term in query)
+        
+        return {
+            'search_query': search_query,
+            'max_results': max_results,
+            'sortBy': 'submittedDate', # newest first
+            'sortOrder': 'descending'
+        }
+    
+    def _parse_arxiv_entries(self, feed) -> List[Dict]:
+        """Convert arXiv Atom entries to paper dicts"""
+        return [
+            {
+                'title': entry.get('title', ''),
+                'authors': [author.get('name', '') for author in entry.get('authors', [])],
+                'summary': entry.get('summary', '')[:500] + "...",
+                # arXiv publishes ISO 8601 timestamps, so the date is the first 10 characters
+                'published': entry.get('published', '')[:10],
+                'url': entry.get('id', ''),
+                'categories': [tag.get('term', '') for tag in entry.get('tags', [])]
+            }
+            for entry in feed.entries
+        ]
+    
+    @cached("rss", ttl=3600)
     def search_news(self, query: str, days_back: int = 7) -> List[Dict]:
         """Search news articles using RSS feeds"""
         articles = []
@@ -92,32 +410,18 @@ class DataAPIs:
     def _get_rss_news(self, query: str) -> List[Dict]:
         """Get news from RSS feeds"""
         try:
-            # Tech news RSS feeds
-            rss_feeds = [
-                ("TechCrunch", "https://techcrunch.com/feed/"), # startups and technology news
-                ("BBC Technology", "https://feeds.bbci.co.uk/news/technology/rss.xml"), # focuses on technology news
-                ("Wired", "https://www.wired.com/feed/rss"),
-                ("AI News", "https://www.artificialintelligence-news.com/feed/")
-            ]
+            pattern = self._keyword_pattern(query)
+            if pattern is None:
+                return []
+            
+            # feeds are independent and network-bound, so fetch them all at once
+            with ThreadPoolExecutor(max_workers=len(self.RSS_FEEDS)) as executor:
+                feeds = list(executor.map(self._fetch_rss_feed, [feed_url for _, feed_url in self.RSS_FEEDS]))
             
             articles = []
-            for feed_name, feed_url in rss_feeds:  
-                try:
-                    feed = feedparser.parse(feed_url)
-                    for entry in feed.entries:
-                        # Simple keyword matching
-                        content = f"{entry.get('title', '')} {entry.get('summary', '')}".lower()
-                        if any(keyword in content for keyword in query.lower().split()):
-                            articles.append({
-                                'title': entry.get('title', ''),
-                                'description': entry.get('summary', '')[:300],
-                                'source': feed_name,
-                                'published': entry.get('published', ''),
-                                'url': entry.get('link', '')
-                            })
-                except Exception as e:
-                    logger.warning(f"RSS feed error for {feed_url}: {e}")
-                    continue
+            for (feed_name, _), feed in zip(self.RSS_FEEDS, feeds):
+                if feed is not None:
+                    articles.extend(self._filter_feed_entries(feed_name, feed, pattern))
             
             logger.info(f"Retrieved {len(articles)} articles from RSS feeds")
             return articles
@@ -126,54 +430,260 @@ class DataAPIs:
             logger.error(f"RSS search error: {e}")
             return []
     
+    def _fetch_rss_feed(self, feed_url: str):
+        """Fetch and parse one RSS feed, or None on failure"""
+        try:
+            # fetch through the pooled session; feedparser's own opener does not reuse connections
+            raw_feed = self.session.get(feed_url, timeout=5).content
+            return feedparser.parse(raw_feed)
+        except Exception as e:
+            logger.warning(f"RSS feed error for {feed_url}: {e}")
+            return None
+    
+    def _keyword_pattern(self, query: str) -> Optional[re.Pattern]:
+        """Compile the query keywords into one case-insensitive pattern (None if there are no keywords)"""
+        keywords = query.split()
+        if not keywords:
+            return None
+        return re.compile('|'.join(map(re.escape, keywords)), re.IGNORECASE)
+    
+    def _filter_feed_entries(self, feed_name: str, feed, pattern: re.Pattern) -> List[Dict]:
+        """Keep the feed entries that mention any query keyword"""
+        articles = []
+        for entry in feed.entries:
+            # Simple keyword matching
+            title = entry.get('title', '')
+            summary = entry.get('summary', '')
+            if pattern.search(title) or pattern.search(summary):
+                articles.append({
+                    'title': title,
+                    'description': summary[:300],
+                    'source': feed_name,
+                    'published': entry.get('published', ''),
+                    'url': entry.get('link', '')
+                })
+        return articles
+    
+    GITHUB_CACHE_TTL = 3600
+    
     def search_github_repos(self, query: str, max_results: int = 10) -> List[Dict]:
-        """Search GitHub repositories"""
+        """Search GitHub repositories, revalidating stale cache entries with their ETag"""
+        params_hash = _params_hash({'max_results': max_results})
+        cached_entry = _cache_get_entry("github", query, params_hash)
+        if cached_entry and cached_entry.fetched_at > time.time() - self.GITHUB_CACHE_TTL:
+            return cached_entry.payload
+        
         try:
-            headers = {}
-            # if self.github_token:
-            #     headers['Authorization'] = f'token {self.github_token}'
-            
-            url = "https://api.github.com/search/repositories"  #GitHub API endpoint
-            params = {
-                'q': query,
-                'sort': 'updated', # sort by last updated
-                'order': 'desc', 
-                'per_page': max_results
-            }
+            params, headers = self._github_request(query, max_results, cached_entry)
             
-            response = requests.get(url, params=params, headers=headers, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                repos = []
-                for repo in data.get('items', []):
-                    repos.append({
-                        'name': repo.get('full_name', ''),
-                        'description': repo.get('description', ''),
-                        'stars': repo.get('stargazers_count', 0),
-                        'language': repo.get('language', ''),
-                        'updated': repo.get('updated_at', ''),
-                        'url': repo.get('html_url', '')
-                    })
-                
+            response = self.session.get(self.GITHUB_SEARCH_URL, params=params, headers=headers, timeout=10)
+            status = response.status_code
+            if status == 304 and cached_entry:
+                _cache_touch("github", query, params_hash)
+                return cached_entry.payload
+            if status == 200:
+                repos = self._parse_github_repos(response.json())
                 logger.info(f"Retrieved {len(repos)} GitHub repositories")
+                if repos:
+                    _cache_put("github", query, params_hash, repos, response.headers.get('ETag'))
                 return repos
+            logger.warning(f"GitHub search returned {status}")
+            
+        except Exception as e:
+            logger.error(f"GitHub search error: {e}")
+        
+        # rate limited or failing: a stale result beats none
+        return cached_entry.payload if cached_entry else []
+    
+    def _github_request(self, query: str, max_results: int, cached_entry: Optional[CacheEntry] = None):
+        """Build query params and headers for the GitHub search API"""
+        headers = {}
+        # set per request so the token never reaches arXiv or RSS hosts on the shared session
+        if self.github_token:
+            headers['Authorization'] = f'token {self.github_token}'
+        # conditional request: a 304 reply does not count against the rate limit
+        if cached_entry and cached_entry.etag:
+            headers['If-None-Match'] = cached_entry.etag
+        
+        params = {
+            'q': query,
+            'sort': 'updated', # sort by last updated
+            'order': 'desc', 
+            'per_page': max_results
+        }
+        return params, headers
+    
+    def _parse_github_repos(self, data: Dict[str, Any]) -> List[Dict]:
+        """Extract repository fields from a GitHub search response"""
+        repos = []
+        for repo in data.get('items', []):
+            repos.append({
+                'name': repo.get('full_name', ''),
+                'description': (repo.get('description') or '')[:300],
+                'stars': repo.get('stargazers_count', 0),
+                'language': repo.get('language', ''),
+                'updated': repo.get('updated_at', ''),
+                'url': repo.get('html_url', '')
+            })
+        return repos
+    
+    # Async counterparts used by the research fan-out; all calls share one aiohttp session
+    
+    def create_async_session(self) -> aiohttp.ClientSession:
+        """Create a pooled aiohttp session (must be called inside a running event loop)"""
+        return aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=20, limit_per_host=5),
+            timeout=aiohttp.ClientTimeout(total=10),
+            headers={'User-Agent': USER_AGENT}
+        )
+    
+    @cached("arxiv", ttl=3600)
+    async def search_arxiv_papers_async(self, http: aiohttp.ClientSession, query: Union[str, List[str]], max_results: int = 10) -> List[Dict]:
+        """Search arXiv through its Atom API without blocking the event loop"""
+        try:
+            async with http.get(self.ARXIV_API_URL, params=self._arxiv_query(query, max_results)) as response:
+                feed = feedparser.parse(await response.read())
+            
+            papers = self._parse_arxiv_entries(feed)
+            logger.info(f"Retrieved {len(papers)} papers from arXiv")
+            return papers
+            
+        except Exception as e:
+            logger.error(f"arXiv search error: {e}")
+            return []
+    
+    @cached("rss", ttl=3600)
+    async def search_news_async(self, http: aiohttp.ClientSession, query: str, days_back: int = 7) -> List[Dict]:
+        """Fetch all RSS feeds concurrently and keep matching articles"""
+        pattern = self._keyword_pattern(query)
+        if pattern is None:
+            return []
+        
+        feeds = await asyncio.gather(*[
+            self._fetch_rss_async(http, feed_name, feed_url, pattern)
+            for feed_name, feed_url in self.RSS_FEEDS
+        ])
+        articles = [article for feed_articles in feeds for article in feed_articles]
+        
+        logger.info(f"Retrieved {len(articles)} articles from RSS feeds")
+        return articles
+    
+    async def _fetch_rss_async(self, http: aiohttp.ClientSession, feed_name: str, feed_url: str, pattern: re.Pattern) -> List[Dict]:
+        """Fetch one RSS feed and filter its entries"""
+        try:
+            async with http.get(feed_url, timeout=aiohttp.ClientTimeout(total=5)) as response:
+                feed = feedparser.parse(await response.read())
+            return self._filter_feed_entries(feed_name, feed, pattern)
+        except Exception as e:
+            logger.warning(f"RSS feed error for {feed_url}: {e}")
+            return []
+    
+    async def search_github_repos_async(self, http: aiohttp.ClientSession, query: str, max_results: int = 10) -> List[Dict]:
+        """Search GitHub repositories without blocking the event loop"""
+        params_hash = _params_hash({'max_results': max_results})
+        cached_entry = _cache_get_entry("github", query, params_hash)
+        if cached_entry and cached_entry.fetched_at > time.time() - self.GITHUB_CACHE_TTL:
+            return cached_entry.payload
+        
+        try:
+            params, headers = self._github_request(query, max_results, cached_entry)
+            
+            async with await self._get_with_retry(http, self.GITHUB_SEARCH_URL, params=params, headers=headers) as response:
+                status = response.status
+                if status == 304 and cached_entry:
+                    _cache_touch("github", query, params_hash)
+                    return cached_entry.payload
+                if status == 200:
+                    repos = self._parse_github_repos(await response.json())
+                    logger.info(f"Retrieved {len(repos)} GitHub repositories")
+                    if repos:
+                        _cache_put("github", query, params_hash, repos, response.headers.get('ETag'))
+                    return repos
+            logger.warning(f"GitHub search returned {status}")
             
         except Exception as e:
             logger.error(f"GitHub search error: {e}")
         
-        return []
+        # rate limited or failing: a stale result beats none
+        return cached_entry.payload if cached_entry else []
+    
+    async def _get_with_retry(self, http: aiohttp.ClientSession, url: str, **kwargs) -> aiohttp.ClientResponse:
+        """GET with the same retry policy as the requests adapter (Retry-After aware, bounded by RETRY_AFTER_MAX)"""
+        for attempt in range(RETRY_TOTAL + 1):
+            response = await http.get(url, **kwargs)
+            if response.status not in RETRY_STATUSES or attempt == RETRY_TOTAL:
+                return response
+            
+            retry_after = response.headers.get('Retry-After', '')
+            delay = float(retry_after) if retry_after.isdigit() else RETRY_BACKOFF * (2 ** attempt)
+            if delay > RETRY_AFTER_MAX:
+                return response
+            response.release()
+            logger.warning(f"{url} returned {response.status}, retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+# rate limits (429) and transient server errors (5xx) are worth retrying
+GEMINI_RETRY_ERRORS = (google_exceptions.TooManyRequests, google_exceptions.ServerError)
+
+# one cap on in-flight Gemini calls for the whole process, across every client and event loop
+GEMINI_CONCURRENCY = int(os.getenv('GEMINI_CONCURRENCY', '4'))
+_gemini_slots = threading.BoundedSemaphore(GEMINI_CONCURRENCY)
+GEMINI_SLOT_POLL = 0.05
+
+async def _acquire_gemini_slot():
+    """Wait for a process-wide Gemini slot without blocking the event loop (safe to cancel)"""
+    while not _gemini_slots.acquire(blocking=False):
+        await asyncio.sleep(GEMINI_SLOT_POLL)
+
+class GeminiAsyncClient:
+    """Async Gemini access shared by all agents: holds a process-wide slot per call and backs off on 429/5xx"""
+    
+    MAX_RETRIES = 3
+    
+    def __init__(self, model):
+        self._model = model
+    
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        """Yield response text chunks; a request is retried only if it failed before its first chunk"""
+        await _acquire_gemini_slot()
+        try:
+            for attempt in range(self.MAX_RETRIES + 1):
+                started = False
+                try:
+                    response = await self._model.generate_content_async(prompt, stream=True)
+                    async for chunk in response:
+                        started = True
+                        yield chunk.text
+                    return
+                except GEMINI_RETRY_ERRORS as e:
+                    if started or attempt == self.MAX_RETRIES:
+                        raise
+                    delay = RETRY_BACKOFF * (2 ** attempt)
+                    logger.warning(f"Gemini call failed ({e}), retrying in {delay:.1f}s")
+                    await asyncio.sleep(delay)
+        finally:
+            _gemini_slots.release()
+    
+    async def complete(self, prompt: str) -> str:
+        """Return the full response text"""
+        return ''.join([chunk async for chunk in self.stream(prompt)])
 
 class GeminiLLM:
     """Google Gemini API integration"""
     
-    def __init__(self):
+    RESPONSE_CACHE_SIZE = 128
+    
+    def __init__(self, session: Optional[requests.Session] = None):
         self.api_key = os.getenv('GOOGLE_API_KEY', '')
         self.has_api_key = bool(self.api_key)
+        self.session = session  # shared HTTP session for any REST fallback
+        self._response_cache = OrderedDict()  # sha256(prompt) -> response text, least recently used first
         
         if self.has_api_key:
             try:
                 genai.configure(api_key=self.api_key)
                 self.model = genai.GenerativeModel('gemini-1.5-flash')  
+                self.client = GeminiAsyncClient(self.model)
                 logger.info("Google Gemini API initialized successfully")
             except Exception as e:
                 logger.error(f"Gemini initialization error: {e}")
@@ -181,101 +691,346 @@ class GeminiLLM:
         else:
             logger.warning("Google API key not found")
     
-    def generate_response(self, prompt: str) -> str:
-        """Generate response using Gemini API"""
+    def _cache_key(self, prompt: str) -> str:
+        return hashlib.sha256(prompt.encode()).hexdigest()
+    
+    def _get_cached_response(self, key: str) -> Optional[str]:
+        """Return a cached response for an identical prompt, if any"""
+        response = self._response_cache.get(key)
+        if response is not None:
+            self._response_cache.move_to_end(key)
+        return response
+    
+    def _cache_response(self, key: str, response: str):
+        """Remember a successful response, evicting the least recently used one"""
+        self._response_cache[key] = response
+        self._response_cache.move_to_end(key)
+        if len(self._response_cache) > self.RESPONSE_CACHE_SIZE:
+            self._response_cache.popitem(last=False)
+    
+    def stream_response(self, prompt: str) -> Iterator[str]:
+        """Yield response text chunks as Gemini generates them"""
+        for chunk in self.model.generate_content(prompt, stream=True):
+            yield chunk.text
+    
+    async def stream_response_async(self, prompt: str) -> AsyncIterator[str]:
+        """Yield response text chunks as Gemini generates them, without blocking the event loop"""
+        async for chunk in self.client.stream(prompt):
+            yield chunk
+    
+    def generate_response(self, prompt: str, on_chunk: Optional[Callable[[str], None]] = None) -> str:
+        """Generate response using Gemini API
+        
+        The response is streamed; on_chunk, if given, receives each text chunk as it arrives.
+        """
+        if not self.has_api_key:
+            return "Gemini API not configured. Please add GOOGLE_API_KEY to .env file."
+        
+        key = self._cache_key(prompt)
+        cached_response = self._get_cached_response(key)
+        if cached_response is not None:
+            if on_chunk is not None:
+                on_chunk(cached_response)
+            return cached_response
+        
+        try:
+            chunks = []
+            for chunk in self.stream_response(prompt):
+                chunks.append(chunk)
+                if on_chunk is not None:
+                    on_chunk(chunk)
+            
+            response = ''.join(chunks)
+            self._cache_response(key, response)
+            return response
+            
+        except Exception as e:
+            logger.error(f"Gemini API Exception: {e}")
+            return f"API Exception: {str(e)}"
+    
+    async def generate_response_async(self, prompt: str, on_chunk: Optional[Callable[[str], None]] = None) -> str:
+        """Generate response using Gemini API without blocking the event loop
+        
+        The response is streamed; on_chunk, if given, receives each text chunk as it arrives.
+        """
         if not self.has_api_key:
             return "Gemini API not configured. Please add GOOGLE_API_KEY to .env file."
         
+        key = self._cache_key(prompt)
+        cached_response = self._get_cached_response(key)
+        if cached_response is not None:
+            if on_chunk is not None:
+                on_chunk(cached_response)
+            return cached_response
+        
         try:
-            response = self.model.generate_content(prompt)
-            return response.text
+            chunks = []
+            async for chunk in self.stream_response_async(prompt):
+                chunks.append(chunk)
+                if on_chunk is not None:
+                    on_chunk(chunk)
+            
+            response = ''.join(chunks)
+            self._cache_response(key, response)
+            return response
             
         except Exception as e:
             logger.error(f"Gemini API Exception: {e}")
             return f"API Exception: {str(e)}"
 
+# Gemini prompt templates, filled with str.format; JSON payloads are interpolated compactly
+
+RESEARCH_PROMPT_TEMPLATE = """
+Based on the following real research data, provide a comprehensive research analysis for: {title}
+
+Description: {description}
+
+Real Data Sources:
+
+Academic Papers (arXiv):
+{papers_json}
+
+Recent News:
+{news_json}
+
+GitHub Projects:
+{github_json}
+
+Please provide:
+1. Current state analysis with specific statistics from the data
+2. Key trends and developments identified in the sources  
+3. Major players and organizations mentioned
+4. Technical innovations and breakthroughs
+5. Market dynamics and growth patterns
+6. Confidence assessment based on data quality and sources
+
+Focus on factual insights derived from the actual data provided.
+Provide specific numbers and statistics where available.
+"""
+
+ANALYSIS_PROMPT_TEMPLATE = """
+Analyze the following research findings and raw data sources:
+
+Research Findings:
+{research_data}
+
+Raw Data Summary:
+- Academic Papers: {papers_count} papers
+- News Articles: {news_count} articles  
+- GitHub Projects: {github_count} repositories
+
+Provide comprehensive statistical and trend analysis including:
+1. Quantitative patterns and correlations with specific numbers
+2. Market growth rates and statistical projections
+3. Technology adoption trends and timelines
+4. Investment patterns and funding analysis
+5. Competitive landscape insights
+6. Risk factors and opportunity assessments
+7. Geographic and demographic patterns
+
+Use actual data points from the sources to support your analysis.
+Provide specific statistics and growth figures where possible.
+"""
+
+INNOVATION_PROMPT_TEMPLATE = """
+Based on the research findings and analysis, generate breakthrough innovation opportunities:
+
+Research Data:
+{research_data}
+
+Analysis Insights:
+{analysis_insights}
+
+Generate innovative solutions including:
+1. Disruptive technology opportunities with feasibility assessments
+2. Cross-industry application potential and market sizes
+3. Novel business model innovations
+4. Technical breakthrough possibilities and timelines
+5. Implementation strategies and resource requirements
+6. Competitive advantage analysis
+7. Investment potential and ROI projections
+8. Market gap analysis and untapped opportunities
+
+Focus on commercially viable innovations that address real market needs.
+Provide specific market size estimates and implementation timelines.
+"""
+
+ENVIRONMENT_PROMPT_TEMPLATE = """
+Analyze system performance and provide optimization recommendations:
+
+Current Performance Metrics:
+{metrics_json}
+
+Task Context: {title}
+
+Provide recommendations for:
+1. System performance optimization strategies
+2. Resource allocation and scaling approaches  
+3. Quality assurance and reliability measures
+4. Cost optimization opportunities
+5. Technology stack recommendations
+6. Risk mitigation and security strategies
+7. Deployment and maintenance best practices
+8. Future scalability planning
+
+Focus on actionable recommendations with measurable outcomes.
+"""
+
+SOURCE_SUMMARY_PROMPT_TEMPLATE = """
+Summarize the following {source} for a research analyst:
+{payload_json}
+
+Keep specific names, numbers, dates and technical terms; drop boilerplate.
+Answer in at most 200 words.
+"""
+
+def dump_results(results: Any) -> bytes:
+    """Encode workflow results as JSON, flattening AgentResult stages with AgentResult.to_dict
+    
+    orjson serialises dataclasses natively and would never call the default hook,
+    nesting every stage's fields under "payload"; OPT_PASSTHROUGH_DATACLASS routes them to it.
+    """
+    return orjson.dumps(
+        results,
+        default=AgentResult.to_dict,
+        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_PASSTHROUGH_DATACLASS
+    )
+
+def _to_json(data: Any) -> str:
+    """Compact JSON for prompt payloads (whitespace only costs tokens)"""
+    return orjson.dumps(data).decode()
+
+def _research_payloads(research_data: Dict[str, Any]) -> Dict[str, str]:
+    """Serialise each source for the research prompt"""
+    return {
+        'papers_json': _to_json(research_data['papers'][:3]),
+        'news_json': _to_json(research_data['news']),
+        'github_json': _to_json(research_data['github'][:3])
+    }
+
+def _chunk_forwarder(agent_id: str, stream: Optional[queue.Queue]) -> Optional[Callable[[str], None]]:
+    """Callback that tags each Gemini text chunk with the agent id and puts it on stream"""
+    if stream is None:
+        return None
+    return lambda chunk: stream.put((agent_id, chunk))
+
 class ResearchAgent:
     """Research Agent with real data sources"""
     
-    def __init__(self):
+    # caps on gathered items; everything kept is serialised into prompts
+    MAX_PAPERS = 10
+    MAX_NEWS = 5
+    MAX_GITHUB = 5
+    
+    # ~6K tokens of source JSON (at ~4 characters per token); above it each source is summarised first
+    MAP_REDUCE_THRESHOLD = 24000
+    SUMMARY_CACHE_TTL = 7 * 24 * 3600
+    SOURCE_LABELS = {
+        'papers_json': 'academic papers (arXiv)',
+        'news_json': 'recent news articles',
+        'github_json': 'GitHub projects'
+    }
+    
+    def __init__(self, llm: Optional[GeminiLLM] = None):
         self.agent_id = "research_agent"
         self.role = AgentRole.RESEARCH
         self.api_client = DataAPIs()
-        self.llm = GeminiLLM()
+        self.llm = llm or GeminiLLM(session=self.api_client.session)
+        # prompt templates are bound per agent so a subclass or instance can swap them
+        self._prompt_tpl = RESEARCH_PROMPT_TEMPLATE
+        self._summary_tpl = SOURCE_SUMMARY_PROMPT_TEMPLATE
         
-    def process_task(self, task: ResearchTask) -> Dict[str, Any]:
+    def process_task(self, task: ResearchTask, stream: Optional[queue.Queue] = None, timestamp: Optional[str] = None) -> AgentResult:
         """Process research task with real data"""
-        start_time = time.time()
+        return _run_async(self.process_task_async(task, stream, timestamp))
+    
+    async def process_task_async(self, task: ResearchTask, stream: Optional[queue.Queue] = None, timestamp: Optional[str] = None) -> AgentResult:
+        """Process research task with real data; stream, if given, receives (agent_id, text_chunk) tuples"""
+        start_time = time.perf_counter()
+        timestamp = timestamp or datetime.now().isoformat()  # shared by the success and error results
         logger.info(f"Research Agent processing: {task.title}")
         
         try:
             # Gather data from multiple sources
-            research_data = self._gather_research_data(task.title, task.description)
+            research_data = await self._gather_research_data_async(task.title, task.description)
             
             # Generate comprehensive analysis using Gemini
-            analysis_prompt = f"""
-            Based on the following real research data, provide a comprehensive research analysis for: {task.title}
-
-            Description: {task.description}
-
-            Real Data Sources:
-            
-            Academic Papers (arXiv):
-            {json.dumps(research_data['papers'][:3], indent=2)}
-            
-            Recent News:
-            {json.dumps(research_data['news'], indent=2)}
-            
-            GitHub Projects:
-            {json.dumps(research_data['github'][:3], indent=2)}
-
-            Please provide:
-            1. Current state analysis with specific statistics from the data
-            2. Key trends and developments identified in the sources  
-            3. Major players and organizations mentioned
-            4. Technical innovations and breakthroughs
-            5. Market dynamics and growth patterns
-            6. Confidence assessment based on data quality and sources
-
-            Focus on factual insights derived from the actual data provided.
-            Provide specific numbers and statistics where available.
-            """
-            
-            analysis = self.llm.generate_response(analysis_prompt)
-            
-            result = {
-                'agent_id': self.agent_id,
-                'task_id': task.id,
-                'research_data': analysis,
-                'raw_data_sources': research_data,
-                'confidence_score': self._calculate_confidence(research_data),
-                'timestamp': datetime.now().isoformat(),
-                'processing_time': time.time() - start_time,
-                'data_sources_count': {
-                    'papers': len(research_data['papers']),
-                    'news': len(research_data['news']),
-                    'github': len(research_data['github'])
+            payloads = _research_payloads(research_data)
+            
+            if self.llm.has_api_key and sum(map(len, payloads.values())) > self.MAP_REDUCE_THRESHOLD:
+                payloads = await self._summarise_payloads_async(payloads)
+            
+            analysis_prompt = self._prompt_tpl.format(
+                title=task.title,
+                description=task.description,
+                **payloads
+            )
+            
+            analysis = await self.llm.generate_response_async(analysis_prompt, _chunk_forwarder(self.agent_id, stream))
+            
+            result = AgentResult(
+                agent_id=self.agent_id,
+                task_id=task.id,
+                timestamp=timestamp,
+                processing_time=time.perf_counter() - start_time,
+                payload={
+                    'research_data': analysis,
+                    'raw_data_sources': research_data,
+                    'confidence_score': self._calculate_confidence(research_data),
+                    'data_sources_count': {
+                        'papers': len(research_data['papers']),
+                        'news': len(research_data['news']),
+                        'github': len(research_data['github'])
+                    }
                 }
-            }
+            )
             
-            logger.info(f"Research Agent completed task in {result['processing_time']:.2f}s")
+            logger.info(f"Research Agent completed task in {result.processing_time:.2f}s")
             return result
             
         except Exception as e:
             logger.error(f"Research Agent error: {e}")
-            return {
-                'agent_id': self.agent_id,
-                'task_id': task.id,
-                'error': str(e),
-                'timestamp': datetime.now().isoformat()
-            }
+            return AgentResult(
+                agent_id=self.agent_id,
+                task_id=task.id,
+                timestamp=timestamp,
+                payload={'error': str(e)}
+            )
+    
+    async def _summarise_payloads_async(self, payloads: Dict[str, str]) -> Dict[str, str]:
+        """Map step: replace each large source payload with a Gemini summary, in parallel"""
+        summaries = await asyncio.gather(*[
+            self._summarise_source_async(key, payload_json) for key, payload_json in payloads.items()
+        ])
+        return dict(zip(payloads, summaries))
     
+    async def _summarise_source_async(self, key: str, payload_json: str) -> str:
+        """Summarise one source, reusing summaries of identical payloads from the API cache"""
+        payload_hash = hashlib.blake2b(payload_json.encode()).hexdigest()
+        cached_summary = _cache_get("gemini_summary", key, payload_hash, self.SUMMARY_CACHE_TTL)
+        if cached_summary is not None:
+            return cached_summary
+        
+        summary = await self.llm.generate_response_async(self._summary_tpl.format(
+            source=self.SOURCE_LABELS[key],
+            payload_json=payload_json
+        ))
+        if summary.startswith("API Exception"):
+            return payload_json  # fall back to the raw data for this source
+        
+        _cache_put("gemini_summary", key, payload_hash, summary)
+        return summary
+
 
 # This method collects data from multiple sources (arXiv papers, news articles, and GitHub repositories)
 # based on the task’s title and description, organizing the results into a dictionary.
 
     def _gather_research_data(self, title: str, description: str) -> Dict[str, Any]:
         """Gather data from multiple real sources"""
+        return _run_async(self._gather_research_data_async(title, description))
+    
+    async def _gather_research_data_async(self, title: str, description: str) -> Dict[str, Any]:
+        """Query all sources concurrently so latency is the slowest source, not the sum"""
         # Extract key terms for search
         search_terms = self._extract_search_terms(title, description)
         
@@ -285,18 +1040,30 @@ class ResearchAgent:
             'github': []
         }
         
-        # Search academic papers
-        for term in search_terms:  
-            papers = self.api_client.search_arxiv_papers(term, max_results=5)
-            research_data['papers'].extend(papers)
+        # one pooled session for every data source call; only this stage makes HTTP requests
+        async with self.api_client.create_async_session() as http:
+            results = await asyncio.gather(
+                # academic papers, all terms in one OR query
+                self.api_client.search_arxiv_papers_async(http, search_terms, max_results=5 * len(search_terms)),
+                # recent news
+                self.api_client.search_news_async(http, search_terms[0], days_back=14),
+                # GitHub repositories
+                self.api_client.search_github_repos_async(http, search_terms[0], max_results=self.MAX_GITHUB),
+                return_exceptions=True
+            )
+        
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Research data source error: {result}")
+        results = [[] if isinstance(result, Exception) else result for result in results]
         
-        # Search recent news
-        news = self.api_client.search_news(search_terms[0], days_back=14)
-        research_data['news'] = news
+        papers, news, github_repos = results
         
-        # Search GitHub repositories
-        github_repos = self.api_client.search_github_repos(search_terms[0], max_results=8)
-        research_data['github'] = github_repos
+        # guard against the same entry id appearing twice in the feed
+        unique_papers = list({paper['url']: paper for paper in papers}.values())
+        research_data['papers'] = unique_papers[:self.MAX_PAPERS]
+        research_data['news'] = news[:self.MAX_NEWS]
+        research_data['github'] = github_repos[:self.MAX_GITHUB]
         
         return research_data
     
@@ -305,44 +1072,9 @@ class ResearchAgent:
         combined_text = f"{title} {description}".lower()
         
         # Basic keyword extraction  
-        key_terms = []
-        
-        # terms
-
-        if 'healthcare' in combined_text or 'medical' in combined_text:
-            key_terms = ['artificial intelligence healthcare', 'machine learning medicine', 'AI diagnosis']
-        elif 'ai' in combined_text or 'artificial intelligence' in combined_text:
-            key_terms = ['artificial intelligence', 'machine learning', 'deep learning']
-        elif 'generative' in combined_text or 'gpt' in combined_text:
-            key_terms = ['generative ai', 'gpt', 'transformer models']
-        elif 'blockchain' in combined_text or 'crypto' in combined_text:
-            key_terms = ['blockchain technology', 'cryptocurrency', 'decentralized finance']
-        elif 'sustainability' in combined_text or 'climate' in combined_text:
-            key_terms = ['sustainability technology', 'climate change AI', 'green technology']
-        elif 'robotics' in combined_text or 'automation' in combined_text:
-            key_terms = ['robotics technology', 'automation systems', 'AI robotics']
-        elif 'finance' in combined_text or 'investment' in combined_text:
-            key_terms = ['financial technology', 'investment strategies', 'AI in finance']
-        elif 'education' in combined_text or 'learning' in combined_text:
-            key_terms = ['educational technology', 'AI in education', 'personalized learning']
-        elif 'energy' in combined_text or 'renewable' in combined_text:
-            key_terms = ['renewable energy technology', 'solar power AI', 'wind energy systems']
-        elif 'cybersecurity' in combined_text or 'security' in combined_text:
-            key_terms = ['cybersecurity AI', 'threat detection', 'security automation']
-        elif 'transportation' in combined_text or 'mobility' in combined_text:
-            key_terms = ['transportation technology', 'autonomous vehicles', 'smart mobility']
-        elif 'agriculture' in combined_text or 'farming' in combined_text:
-            key_terms = ['agricultural technology', 'precision farming AI', 'smart agriculture']
-        elif 'entertainment' in combined_text or 'media' in combined_text:
-            key_terms = ['entertainment technology', 'media AI', 'content creation tools']
-        elif 'gaming' in combined_text or 'game' in combined_text:
-            key_terms = ['gaming technology', 'game AI', 'interactive entertainment']
-        elif 'smart home' in combined_text or 'iot' in combined_text:
-            key_terms = ['smart home technology', 'IoT devices', 'home automation']
-        elif 'supply chain' in combined_text or 'logistics' in combined_text:
-            key_terms = ['supply chain technology', 'logistics AI', 'smart logistics']
-        elif 'social media' in combined_text or 'communication' in combined_text:
-            key_terms = ['social media technology', 'communication AI', 'digital marketing tools']
+        matched_rules = [_KEYWORD_RULE[match.group(1)] for match in _KEYWORD_PATTERN.finditer(combined_text)]
+        if matched_rules:
+            key_terms = list(SEARCH_TERM_RULES[min(matched_rules)][1])
         else:
             words = title.split()
             key_terms = [word for word in words if len(word) > 3][:3]  #takes up to three words to form the key_terms list
@@ -355,25 +1087,7 @@ class ResearchAgent:
     
     def _calculate_confidence(self, data: Dict[str, Any]) -> float:
         """Calculate confidence based on data availability"""
-        sources = 0
-        total_items = 0
-        
-        if data['papers']:
-            sources += 1
-            total_items += len(data['papers'])
-        
-        if data['news']:
-            sources += 1
-            total_items += len(data['news'])
-        
-        if data['github']:
-            sources += 1
-            total_items += len(data['github'])
-        
-        base_confidence = min(sources * 0.25, 0.75)  #max 0.75 from sources if we add more sources in the future
-        volume_bonus = min(total_items * 0.01, 0.25)  #the more items the higher the bonus ( total_items => sum of all papers, news articles, and repositories collected in the research_data dictionary)
-        
-        return min(base_confidence + volume_bonus, 1.0)
+        return confidence_for_counts(*source_counts(data).tolist())
 
 
 
@@ -381,153 +1095,118 @@ class ResearchAgent:
 class AnalysisAgent:
     """Analysis Agent for data insights"""
     
-    def __init__(self):
+    def __init__(self, llm: Optional[GeminiLLM] = None):
         self.agent_id = "analysis_agent"
         self.role = AgentRole.ANALYSIS
-        self.llm = GeminiLLM()
+        self.llm = llm or GeminiLLM()
+        self._prompt_tpl = ANALYSIS_PROMPT_TEMPLATE
     
-    def process_task(self, task: ResearchTask, context: Dict[str, Any] = None) -> Dict[str, Any]:
+    def process_task(self, task: ResearchTask, context: Dict[str, Any] = None, stream: Optional[queue.Queue] = None, timestamp: Optional[str] = None) -> AgentResult:
         """Analyze research data"""
-        start_time = time.time()
+        return _run_async(self.process_task_async(task, context, stream, timestamp))
+    
+    async def process_task_async(self, task: ResearchTask, context: Dict[str, Any] = None, stream: Optional[queue.Queue] = None, timestamp: Optional[str] = None) -> AgentResult:
+        """Analyze research data; stream, if given, receives (agent_id, text_chunk) tuples"""
+        start_time = time.perf_counter()
+        timestamp = timestamp or datetime.now().isoformat()  # shared by the success and error results
         logger.info(f"Analysis Agent processing: {task.title}")
         
         try:
             research_data = context.get('research_data', '') if context else ''
             raw_data = context.get('raw_data_sources', {}) if context else {}
             
-            analysis_prompt = f"""
-            Analyze the following research findings and raw data sources:
-
-            Research Findings:
-            {research_data}
-
-            Raw Data Summary:
-            - Academic Papers: {len(raw_data.get('papers', []))} papers
-            - News Articles: {len(raw_data.get('news', []))} articles  
-            - GitHub Projects: {len(raw_data.get('github', []))} repositories
-
-            Provide comprehensive statistical and trend analysis including:
-            1. Quantitative patterns and correlations with specific numbers
-            2. Market growth rates and statistical projections
-            3. Technology adoption trends and timelines
-            4. Investment patterns and funding analysis
-            5. Competitive landscape insights
-            6. Risk factors and opportunity assessments
-            7. Geographic and demographic patterns
-
-            Use actual data points from the sources to support your analysis.
-            Provide specific statistics and growth figures where possible.
-            """
-            
-            analysis = self.llm.generate_response(analysis_prompt)
-            
-            result = {
-                'agent_id': self.agent_id,
-                'task_id': task.id,
-                'analysis_insights': analysis,
-                'data_quality_score': self._assess_data_quality(raw_data),
-                'timestamp': datetime.now().isoformat(),
-                'processing_time': time.time() - start_time
-            }
+            analysis_prompt = self._prompt_tpl.format(
+                research_data=research_data,
+                papers_count=len(raw_data.get('papers', [])),
+                news_count=len(raw_data.get('news', [])),
+                github_count=len(raw_data.get('github', []))
+            )
+            
+            analysis = await self.llm.generate_response_async(analysis_prompt, _chunk_forwarder(self.agent_id, stream))
+            
+            result = AgentResult(
+                agent_id=self.agent_id,
+                task_id=task.id,
+                timestamp=timestamp,
+                processing_time=time.perf_counter() - start_time,
+                payload={
+                    'analysis_insights': analysis,
+                    'data_quality_score': self._assess_data_quality(raw_data)
+                }
+            )
             
-            logger.info(f"Analysis Agent completed task in {result['processing_time']:.2f}s")
+            logger.info(f"Analysis Agent completed task in {result.processing_time:.2f}s")
             return result
             
         except Exception as e:
             logger.error(f"Analysis Agent error: {e}")
-            return {
-                'agent_id': self.agent_id,
-                'task_id': task.id,
-                'error': str(e),
-                'timestamp': datetime.now().isoformat()
-            }
+            return AgentResult(
+                agent_id=self.agent_id,
+                task_id=task.id,
+                timestamp=timestamp,
+                payload={'error': str(e)}
+            )
     
     def _assess_data_quality(self, raw_data: Dict[str, Any]) -> float:
         """Assess quality of source data"""
-        quality_score = 0.0
-        
-        # Academic papers (highest quality)
-        papers = raw_data.get('papers', [])
-        if papers:
-            quality_score += min(len(papers) * 0.1, 0.4)
-        
-        # Recent news (medium quality)
-        news = raw_data.get('news', [])
-        if news:
-            quality_score += min(len(news) * 0.05, 0.3)
-        
-        # GitHub (practical relevance)  
-        github = raw_data.get('github', [])
-        if github:
-            quality_score += min(len(github) * 0.03, 0.3)
-        
-        return min(quality_score, 1.0)
+        return data_quality_for_counts(*source_counts(raw_data).tolist())
     
 
     
 ## Innovation Agent for breakthrough ideas
 class InnovationAgent:
     
-    def __init__(self):
+    def __init__(self, llm: Optional[GeminiLLM] = None):
         self.agent_id = "innovation_agent"
         self.role = AgentRole.INNOVATION
-        self.llm = GeminiLLM()
+        self.llm = llm or GeminiLLM()
+        self._prompt_tpl = INNOVATION_PROMPT_TEMPLATE
     
-    def process_task(self, task: ResearchTask, context: Dict[str, Any] = None) -> Dict[str, Any]:
+    def process_task(self, task: ResearchTask, context: Dict[str, Any] = None, stream: Optional[queue.Queue] = None, timestamp: Optional[str] = None) -> AgentResult:
         """Generate innovation opportunities"""
-        start_time = time.time()
+        return _run_async(self.process_task_async(task, context, stream, timestamp))
+    
+    async def process_task_async(self, task: ResearchTask, context: Dict[str, Any] = None, stream: Optional[queue.Queue] = None, timestamp: Optional[str] = None) -> AgentResult:
+        """Generate innovation opportunities; stream, if given, receives (agent_id, text_chunk) tuples"""
+        start_time = time.perf_counter()
+        timestamp = timestamp or datetime.now().isoformat()  # shared by the success and error results
         logger.info(f"Innovation Agent processing: {task.title}")
         
         try:
             research_data = context.get('research_data', '') if context else ''
-            analysis_insights = context.get('analysis_insights', '') if context else ''
-            
-            innovation_prompt = f"""
-            Based on the research findings and analysis, generate breakthrough innovation opportunities:
-
-            Research Data:
-            {research_data}
-
-            Analysis Insights:
-            {analysis_insights}
-
-            Generate innovative solutions including:
-            1. Disruptive technology opportunities with feasibility assessments
-            2. Cross-industry application potential and market sizes
-            3. Novel business model innovations
-            4. Technical breakthrough possibilities and timelines
-            5. Implementation strategies and resource requirements
-            6. Competitive advantage analysis
-            7. Investment potential and ROI projections
-            8. Market gap analysis and untapped opportunities
-
-            Focus on commercially viable innovations that address real market needs.
-            Provide specific market size estimates and implementation timelines.
-            """
-            
-            innovation_ideas = self.llm.generate_response(innovation_prompt)
-            
-            result = {
-                'agent_id': self.agent_id,
-                'task_id': task.id,
-                'innovation_ideas': innovation_ideas,
-                'breakthrough_potential': 0.85,
-                'commercial_viability': 0.78,
-                'timestamp': datetime.now().isoformat(),
-                'processing_time': time.time() - start_time
-            }
+            # empty when innovation runs alongside the analysis stage rather than after it
+            analysis_insights = (context.get('analysis_insights') if context else '') or 'Not available; derive insights from the research data.'
             
-            logger.info(f"Innovation Agent completed task in {result['processing_time']:.2f}s")
+            innovation_prompt = self._prompt_tpl.format(
+                research_data=research_data,
+                analysis_insights=analysis_insights
+            )
+            
+            innovation_ideas = await self.llm.generate_response_async(innovation_prompt, _chunk_forwarder(self.agent_id, stream))
+            
+            result = AgentResult(
+                agent_id=self.agent_id,
+                task_id=task.id,
+                timestamp=timestamp,
+                processing_time=time.perf_counter() - start_time,
+                payload={
+                    'innovation_ideas': innovation_ideas,
+                    'breakthrough_potential': 0.85,
+                    'commercial_viability': 0.78
+                }
+            )
+            
+            logger.info(f"Innovation Agent completed task in {result.processing_time:.2f}s")
             return result
             
         except Exception as e:
             logger.error(f"Innovation Agent error: {e}")
-            return {
-                'agent_id': self.agent_id,
-                'task_id': task.id,
-                'error': str(e),
-                'timestamp': datetime.now().isoformat()
-            }
+            return AgentResult(
+                agent_id=self.agent_id,
+                task_id=task.id,
+                timestamp=timestamp,
+                payload={'error': str(e)}
+            )
         
 
 
@@ -536,73 +1215,65 @@ class InnovationAgent:
 # and providing actionable recommendations for improving efficiency
 class EnvironmentAgent:
   
-    def __init__(self):
+    def __init__(self, llm: Optional[GeminiLLM] = None):
         self.agent_id = "environment_agent"
         self.role = AgentRole.ENVIRONMENT
-        self.llm = GeminiLLM()
+        self.llm = llm or GeminiLLM()
+        self._prompt_tpl = ENVIRONMENT_PROMPT_TEMPLATE
     
-    def process_task(self, task: ResearchTask, context: Dict[str, Any] = None) -> Dict[str, Any]:
+    def process_task(self, task: ResearchTask, context: Dict[str, Any] = None, stream: Optional[queue.Queue] = None, timestamp: Optional[str] = None) -> AgentResult:
         """Optimize system environment"""
-        start_time = time.time()
+        return _run_async(self.process_task_async(task, context, stream, timestamp))
+    
+    async def process_task_async(self, task: ResearchTask, context: Dict[str, Any] = None, stream: Optional[queue.Queue] = None, timestamp: Optional[str] = None) -> AgentResult:
+        """Optimize system environment; stream, if given, receives (agent_id, text_chunk) tuples"""
+        start_time = time.perf_counter()
+        timestamp = timestamp or datetime.now().isoformat()  # shared by the success and error results
         logger.info(f"Environment Agent processing: {task.title}")
         
         try:
             performance_data = self._gather_system_metrics(context)
             
-            optimization_prompt = f"""
-            Analyze system performance and provide optimization recommendations:
-
-            Current Performance Metrics:
-            {json.dumps(performance_data, indent=2)}
-
-            Task Context: {task.title}
-
-            Provide recommendations for:
-            1. System performance optimization strategies
-            2. Resource allocation and scaling approaches  
-            3. Quality assurance and reliability measures
-            4. Cost optimization opportunities
-            5. Technology stack recommendations
-            6. Risk mitigation and security strategies
-            7. Deployment and maintenance best practices
-            8. Future scalability planning
-
-            Focus on actionable recommendations with measurable outcomes.
-            """
-            
-            recommendations = self.llm.generate_response(optimization_prompt)
-            
-            result = {
-                'agent_id': self.agent_id,
-                'task_id': task.id,
-                'management_recommendations': recommendations,
-                'system_health_score': performance_data['health_score'],
-                'optimization_potential': performance_data['optimization_score'],
-                'timestamp': datetime.now().isoformat(),
-                'processing_time': time.time() - start_time
-            }
+            optimization_prompt = self._prompt_tpl.format(
+                metrics_json=_to_json(performance_data),
+                title=task.title
+            )
+            
+            recommendations = await self.llm.generate_response_async(optimization_prompt, _chunk_forwarder(self.agent_id, stream))
+            
+            result = AgentResult(
+                agent_id=self.agent_id,
+                task_id=task.id,
+                timestamp=timestamp,
+                processing_time=time.perf_counter() - start_time,
+                payload={
+                    'management_recommendations': recommendations,
+                    'system_health_score': performance_data['health_score'],
+                    'optimization_potential': performance_data['optimization_score']
+                }
+            )
             
-            logger.info(f"Environment Agent completed task in {result['processing_time']:.2f}s")
+            logger.info(f"Environment Agent completed task in {result.processing_time:.2f}s")
             return result
             
         except Exception as e:
             logger.error(f"Environment Agent error: {e}")
-            return {
-                'agent_id': self.agent_id,
-                'task_id': task.id,
-                'error': str(e),
-                'timestamp': datetime.now().isoformat()
-            }
+            return AgentResult(
+                agent_id=self.agent_id,
+                task_id=task.id,
+                timestamp=timestamp,
+                payload={'error': str(e)}
+            )
     
     def _gather_system_metrics(self, context: Dict[str, Any] = None) -> Dict[str, Any]:
         """Gather system performance metrics"""
         # Calculate dynamic metrics based on actual performance
+        context = context or {}
+        stage_results = {stage: context.get(stage, {}) for stage in ('research', 'analysis', 'innovation')}
         
         # Get actual response times from context
         response_times = {
-            'research': context.get('research', {}).get('processing_time', 0) if context else 0,
-            'analysis': context.get('analysis', {}).get('processing_time', 0) if context else 0,
-            'innovation': context.get('innovation', {}).get('processing_time', 0) if context else 0
+            stage: stage_result.get('processing_time', 0) for stage, stage_result in stage_results.items()
         }
         
         # Calculate health score based on response times and errors
@@ -613,26 +1284,21 @@ class EnvironmentAgent:
         if total_time > 60:
             base_health -= (total_time - 60) * 0.01
         
-        # Check for errors in context
-        error_count = 0
-        if context:
-            # : -0.1 for each failed agent
-            for stage in ['research', 'analysis', 'innovation']:
-                if context.get(stage, {}).get('error'):
-                    error_count += 1
+        # Check for errors in context: -0.1 for each failed agent
+        error_count = sum(1 for stage_result in stage_results.values() if stage_result.get('error'))
         
         health_score = max(base_health - (error_count * 0.1), 0.5)
         
         # Calculate optimization score based on data collection success
-        data_quality = context.get('data_quality_score', 0.8) if context else 0.8
+        data_quality = context.get('data_quality_score', 0.8)
         optimization_score = min(data_quality + 0.1, 1.0)
         
         # Calculate API success rate based on data collection
         api_successes = 0
         api_attempts = 3  # arXiv, RSS, GitHub
         
-        if context and context.get('research', {}).get('raw_data_sources'):
-            raw_data = context['research']['raw_data_sources']
+        raw_data = stage_results['research'].get('raw_data_sources')
+        if raw_data:
             if raw_data.get('papers'): api_successes += 1
             if raw_data.get('news'): api_successes += 1
             if raw_data.get('github'): api_successes += 1
@@ -659,37 +1325,177 @@ class EnvironmentAgent:
 # orchestrator class that manages the entire production ecosystem
 # it initializes the agents, creates tasks, and executes the workflow
 
+_REPORT_SUMMARY_TEMPLATE = """
+#Production AI Research & Innovation Report
+**Generated:** {generated}
+**AI Provider:** Google Gemini (Production Grade)
+**Data Sources:** Real-time API Integration
+
+## Executive Summary
+- **Task ID:** {task_id}
+- **Processing Time:** {total_processing_time:.2f} seconds
+- **Status:** {status}
+- **Confidence Score:** {confidence_score:.1%}
+
+## Data Sources Used
+- **Academic Papers:** {papers} from arXiv
+- **News Articles:** {news} recent articles
+- **GitHub Projects:** {github} repositories
+""".strip()
+
+_REPORT_METRICS_TEMPLATE = """
+## Performance Metrics
+- **System Health:** {system_health_score:.1%}
+- **Data Quality:** {data_quality_score:.1%}
+- **Innovation Potential:** {breakthrough_potential:.1%}
+
+---
+*Powered by Real Data APIs & Google Gemini AI - Production Research Intelligence*
+""".strip()
+
+# report field -> (stage, or None for performance_metrics, result key, fallback)
+_REPORT_FIELDS = {
+    'total_processing_time': (None, 'total_processing_time', 0),
+    'confidence_score': (None, 'confidence_score', 0),
+    'research_data': ('research', 'research_data', 'No research data available'),
+    'analysis_insights': ('analysis', 'analysis_insights', 'No analysis insights available'),
+    'innovation_ideas': ('innovation', 'innovation_ideas', 'No innovation ideas available'),
+    'management_recommendations': ('environment', 'management_recommendations', 'No environment recommendations available'),
+    'system_health_score': ('environment', 'system_health_score', 0),
+    'data_quality_score': ('analysis', 'data_quality_score', 0),
+    'breakthrough_potential': ('innovation', 'breakthrough_potential', 0)
+}
+
+# report body: (heading, field) pairs, placed between the summary and the metrics
+_REPORT_SECTIONS = (
+    ('Research Findings', 'research_data'),
+    ('Analysis Insights', 'analysis_insights'),
+    ('Innovation Opportunities', 'innovation_ideas'),
+    ('Environment Recommendations', 'management_recommendations')
+)
+
+@dataclass(slots=True)
+class ReportView:
+    """Report fields taken from workflow results; the stage texts are the same str objects, not copies"""
+    generated: str
+    task_id: str
+    status: str
+    total_processing_time: float
+    confidence_score: float
+    papers: int
+    news: int
+    github: int
+    research_data: str
+    analysis_insights: str
+    innovation_ideas: str
+    management_recommendations: str
+    system_health_score: float
+    data_quality_score: float
+    breakthrough_potential: float
+    
+    @classmethod
+    def from_results(cls, results: Dict[str, Any]) -> 'ReportView':
+        stages = results.get('stages', {})
+        performance = results.get('performance_metrics', {})
+        data_sources = stages.get('research', {}).get('data_sources_count', {})
+        
+        fields = {}
+        for name, (stage, key, fallback) in _REPORT_FIELDS.items():
+            source = performance if stage is None else stages.get(stage, {})
+            fields[name] = source.get(key, fallback)
+        
+        return cls(
+            generated=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            task_id=results.get('task_id', 'N/A'),
+            status=' Completed Successfully' if performance.get('workflow_success') else '❌ Failed',
+            papers=data_sources.get('papers', 0),
+            news=data_sources.get('news', 0),
+            github=data_sources.get('github', 0),
+            **fields
+        )
+    
+    def _format(self, template: str) -> str:
+        return template.format_map({name: getattr(self, name) for name in self.__slots__})
+    
+    def render_summary_markdown(self) -> str:
+        """Header, summary, sources and metrics only; the stage texts are left to the caller"""
+        return self._format(_REPORT_SUMMARY_TEMPLATE) + "\n\n" + self._format(_REPORT_METRICS_TEMPLATE)
+    
+    def render_markdown(self) -> str:
+        """The full Markdown report"""
+        parts = [self._format(_REPORT_SUMMARY_TEMPLATE)]
+        parts.extend(f"## {heading}\n{getattr(self, field_name)}" for heading, field_name in _REPORT_SECTIONS)
+        parts.append(self._format(_REPORT_METRICS_TEMPLATE))
+        return "\n\n".join(parts)
+
+# ecosystems with results possibly still queued for the background writer
+_live_ecosystems = weakref.WeakSet()
+
+@atexit.register
+def _flush_live_ecosystems():
+    for ecosystem in list(_live_ecosystems):
+        ecosystem.close()
+
+RESEARCH_RESULTS_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS research_results (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        task_id TEXT,
+        results BLOB,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE INDEX IF NOT EXISTS idx_research_results_task_id ON research_results(task_id);
+'''
+
 class ProductionEcosystem:
+    # the background writer commits up to this many results per transaction,
+    # waiting at most SAVE_FLUSH_INTERVAL seconds for a batch to fill
+    SAVE_BATCH_SIZE = 32
+    SAVE_FLUSH_INTERVAL = 0.2
+    
     def __init__(self):
-        self.research_agent = ResearchAgent()
-        self.analysis_agent = AnalysisAgent()
-        self.innovation_agent = InnovationAgent()
-        self.environment_agent = EnvironmentAgent()
+        # one Gemini client (and response cache) shared by all agents
+        self.llm = GeminiLLM()
+        self.research_agent = ResearchAgent(llm=self.llm)
+        self.analysis_agent = AnalysisAgent(llm=self.llm)
+        self.innovation_agent = InnovationAgent(llm=self.llm)
+        self.environment_agent = EnvironmentAgent(llm=self.llm)
         
         self.completed_tasks = []
+        self.conn = None
+        self._save_queue = queue.Queue()  # (task_id, results JSON) pairs for _db_flusher
+        self._writer = None
+        self._writer_lock = threading.Lock()
         self._init_database()
+        _live_ecosystems.add(self)
         
         logger.info("Production Ecosystem initialized with real data APIs")
     
     def _init_database(self):
         try:
-            # SQLite database to store research results
-            conn = sqlite3.connect('ecosystem_data.db')
+            # SQLite database to store research results; the connection stays open for the ecosystem's lifetime
+            conn = sqlite3.connect(DB_PATH, check_same_thread=False)
             cursor = conn.cursor()
-
-            cursor.execute('DROP TABLE IF EXISTS research_results')
             
-            # table for schema
-            cursor.execute('''
-                CREATE TABLE research_results (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    task_id TEXT,
-                    results TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
+            # WAL lets readers and the writer proceed together and drops the per-commit fsync
+            cursor.executescript('''
+                PRAGMA journal_mode=WAL;
+                PRAGMA synchronous=NORMAL;
+                PRAGMA temp_store=MEMORY;
+                PRAGMA mmap_size=268435456;
             ''')
+            
+            # an older web interface created research_results with a different, never-written schema
+            columns = [row[1] for row in cursor.execute('PRAGMA table_info(research_results)')]
+            if columns and 'results' not in columns:
+                cursor.execute('DROP TABLE research_results')
+            
+            # table for schema: the compressed results blob is read only on demand (see load_results)
+            cursor.executescript(RESEARCH_RESULTS_SCHEMA)
+            
+            # cache of arXiv/RSS/GitHub responses, kept across runs
+            _ensure_api_cache_schema(conn)
             conn.commit()
-            conn.close()
+            self.conn = conn
             logger.info("Database initialized successfully")
         except Exception as e:
             logger.error(f"Database initialization error: {e}")
@@ -705,57 +1511,85 @@ class ProductionEcosystem:
         return task
     
 
-    #executes the full research workflow by sequentially running all four agents and aggregating their results
-    def execute_workflow(self, task: ResearchTask) -> Dict[str, Any]:
+    def execute_workflow(self, task: ResearchTask, stream: Optional[queue.Queue] = None,
+                         on_stage: Optional[Callable[[str, AgentResult], None]] = None) -> Dict[str, Any]:
         """Execute complete research workflow with real data"""
+        return _run_async(self.execute_workflow_async(task, stream, on_stage))
+    
+    #runs the four agents as a dependency graph, yielding each stage's result as soon as it finishes:
+    #research -> (analysis || innovation) -> environment
+    async def aiter_stages(self, task: ResearchTask, stream: Optional[queue.Queue] = None,
+                           timestamp: Optional[str] = None) -> AsyncIterator[tuple]:
+        """Yield (stage_name, AgentResult) pairs in completion order"""
+        timestamp = timestamp or datetime.now().isoformat()
+        
+        # research
+        print("Gathering real research data from multiple APIs...")
+        research_result = await self.research_agent.process_task_async(task, stream, timestamp)
+        yield 'research', research_result
+        
+        # analysis and innovation generation both work from the research findings only,
+        # so their Gemini calls run concurrently and whichever finishes first is yielded first
+        research_data = research_result.get('research_data', '')
+        print("Analyzing gathered data with AI insights...")
+        analysis_context = {
+            'research_data': research_data,
+            'raw_data_sources': research_result.get('raw_data_sources', {}),
+            'data_quality_score': research_result.get('confidence_score', 0.8)
+        }
+        print("Generating breakthrough innovation opportunities...")
+        innovation_context = {
+            'research_data': research_data
+        }
+        
+        async def named(stage: str, agent_call) -> tuple:
+            return stage, await agent_call
+        
+        env_context = {'research': research_result}
+        for finished in asyncio.as_completed([
+            named('analysis', self.analysis_agent.process_task_async(task, analysis_context, stream, timestamp)),
+            named('innovation', self.innovation_agent.process_task_async(task, innovation_context, stream, timestamp))
+        ]):
+            stage, stage_result = await finished
+            env_context[stage] = stage_result
+            yield stage, stage_result
+        
+        # environment optimization scores the timings and errors of every earlier stage
+        print("Optimizing system environment...")
+        yield 'environment', await self.environment_agent.process_task_async(task, env_context, stream, timestamp)
+    
+    #executes the full research workflow and aggregates the stage results
+    async def execute_workflow_async(self, task: ResearchTask, stream: Optional[queue.Queue] = None,
+                                     on_stage: Optional[Callable[[str, AgentResult], None]] = None) -> Dict[str, Any]:
+        """Execute complete research workflow with real data
+        
+        stream, if given, receives (agent_id, text_chunk) tuples while Gemini generates,
+        so a caller polling it from another thread can render output before a stage ends.
+        on_stage, if given, is called with (stage_name, result) as each stage finishes.
+        """
         logger.info(f"Starting production workflow: {task.title}")
         
-        workflow_start = time.time()
+        workflow_start = time.perf_counter()
+        workflow_started_at = datetime.now().isoformat()
         results = {
             'task_id': task.id,
             'title': task.title,
-            'workflow_start': datetime.now().isoformat(),
+            'workflow_start': workflow_started_at,
             'stages': {},
             'performance_metrics': {}
         }
         
         try:
-            # research
-            print("Gathering real research data from multiple APIs...")
-            research_result = self.research_agent.process_task(task)
-            results['stages']['research'] = research_result
-            
-            # analysis 
-            print("Analyzing gathered data with AI insights...")
-            analysis_context = {
-                'research_data': research_result.get('research_data', ''),
-                'raw_data_sources': research_result.get('raw_data_sources', {}),
-                'data_quality_score': research_result.get('confidence_score', 0.8)
-            }
-            analysis_result = self.analysis_agent.process_task(task, analysis_context)
-            results['stages']['analysis'] = analysis_result
-            
-            # innovation generation
-            print("Generating breakthrough innovation opportunities...")
-            innovation_context = {
-                'research_data': research_result.get('research_data', ''),
-                'analysis_insights': analysis_result.get('analysis_insights', '')
-            }
-            innovation_result = self.innovation_agent.process_task(task, innovation_context)
-            results['stages']['innovation'] = innovation_result
-            
-            # environment optimization
-            print("Optimizing system environment...")
-            env_context = {
-                'research': research_result,
-                'analysis': analysis_result,
-                'innovation': innovation_result
-            }
-            environment_result = self.environment_agent.process_task(task, env_context)
-            results['stages']['environment'] = environment_result
+            async for stage, stage_result in self.aiter_stages(task, stream, workflow_started_at):
+                results['stages'][stage] = stage_result
+                if on_stage is not None:
+                    on_stage(stage, stage_result)
+            
+            research_result = results['stages']['research']
+            environment_result = results['stages']['environment']
             
             # Calculate overall metrics
-            total_time = time.time() - workflow_start
+            total_time = time.perf_counter() - workflow_start
             results['performance_metrics'] = {
                 'total_processing_time': total_time,
                 'data_sources_used': research_result.get('data_sources_count', {}),
@@ -764,14 +1598,15 @@ class ProductionEcosystem:
                 'workflow_success': True
             }
             
-            # Save to database
+            results['workflow_end'] = datetime.now().isoformat()
+            
+            # Save to database (compressed and written by the background writer)
             self._save_results(results)
             
             task.status = "completed"
             task.results = results
             self.completed_tasks.append(task)
             
-            results['workflow_end'] = datetime.now().isoformat()
             logger.info(f"Production workflow completed in {total_time:.2f}s")
             
             return results
@@ -783,66 +1618,100 @@ class ProductionEcosystem:
             return results
     
     def _save_results(self, results: Dict[str, Any]):
-        """Save results to database"""
+        """Encode results now and queue the bytes for the background writer
+        
+        Encoding here snapshots the results: callers keep the live dict (task.results, reports)
+        and may change it while the write is still queued.
+        """
         try:
-            conn = sqlite3.connect('ecosystem_data.db')
-            cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO research_results (task_id, results)
-                VALUES (?, ?)
-            ''', (results['task_id'], json.dumps(results)))
-            conn.commit()
-            conn.close()
+            # stage results are AgentResult objects until they are written out
+            self._save_queue.put((results['task_id'], dump_results(results)))
         except Exception as e:
             logger.error(f"Database save error: {e}")
+            return
+        with self._writer_lock:
+            # the writer exits once the queue runs dry, so start one if none is running
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._db_flusher, name="results-writer", daemon=True)
+                self._writer.start()
     
-    def generate_report(self, results: Dict[str, Any]) -> str:
-        """Generate comprehensive report"""
-        performance = results.get('performance_metrics', {})
-        research_stage = results.get('stages', {}).get('research', {})
-        analysis_stage = results.get('stages', {}).get('analysis', {})
-        innovation_stage = results.get('stages', {}).get('innovation', {})
-        environment_stage = results.get('stages', {}).get('environment', {})
+    def _db_flusher(self):
+        """Drain queued results into research_results, one transaction per batch"""
+        while True:
+            batch = []
+            deadline = time.monotonic() + self.SAVE_FLUSH_INTERVAL
+            while len(batch) < self.SAVE_BATCH_SIZE:
+                try:
+                    batch.append(self._save_queue.get(timeout=max(deadline - time.monotonic(), 0)))
+                except queue.Empty:
+                    break
+            
+            if batch:
+                self._write_batch(batch)
+                continue
+            
+            with self._writer_lock:
+                if self._save_queue.empty():
+                    self._writer = None
+                    return
+    
+    def _write_batch(self, batch: List[tuple]):
+        # zlib shrinks the repetitive LLM prose several times over
+        rows = [(task_id, zlib.compress(encoded)) for task_id, encoded in batch]
+        try:
+            self._persist_results(rows)
+        except Exception as e:
+            logger.error(f"Database save error: {e}")
+    
+    def _persist_results(self, rows: List[tuple]):
+        """Insert (task_id, results_blob) rows in a single transaction"""
+        with self.conn:
+            self.conn.executemany('''
+                INSERT INTO research_results (task_id, results)
+                VALUES (?, ?)
+            ''', rows)
+    
+    def load_results(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Read back the most recently saved full results for a task, or None"""
+        row = self.conn.execute(
+            'SELECT results FROM research_results WHERE task_id = ? ORDER BY id DESC LIMIT 1',
+            (task_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        blob = row[0]
+        try:
+            blob = zlib.decompress(blob)
+        except zlib.error:
+            pass  # written uncompressed by an older version
+        return orjson.loads(blob)
+    
+    def close(self):
+        """Write out any queued results and close the database connection"""
+        with self._writer_lock:
+            writer = self._writer
+        if writer is not None:
+            writer.join()
         
-        data_sources = research_stage.get('data_sources_count', {})
+        # anything queued without a writer (e.g. a failed thread start) is written here
+        batch = []
+        while not self._save_queue.empty():
+            batch.append(self._save_queue.get_nowait())
+        if batch and self.conn is not None:
+            self._write_batch(batch)
         
-        return f"""
-#Production AI Research & Innovation Report
-**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-**AI Provider:** Google Gemini (Production Grade)
-**Data Sources:** Real-time API Integration
-
-## Executive Summary
-- **Task ID:** {results.get('task_id', 'N/A')}
-- **Processing Time:** {performance.get('total_processing_time', 0):.2f} seconds
-- **Status:** {' Completed Successfully' if performance.get('workflow_success') else '❌ Failed'}
-- **Confidence Score:** {performance.get('confidence_score', 0):.1%}
-
-## Data Sources Used
-- **Academic Papers:** {data_sources.get('papers', 0)} from arXiv
-- **News Articles:** {data_sources.get('news', 0)} recent articles
-- **GitHub Projects:** {data_sources.get('github', 0)} repositories
-
-## Research Findings
-{research_stage.get('research_data', 'No research data available')}
-
-## Analysis Insights
-{analysis_stage.get('analysis_insights', 'No analysis insights available')}
-
-## Innovation Opportunities
-{innovation_stage.get('innovation_ideas', 'No innovation ideas available')}
-
-## Environment Recommendations
-{environment_stage.get('management_recommendations', 'No environment recommendations available')}
-
-## Performance Metrics
-- **System Health:** {environment_stage.get('system_health_score', 0):.1%}
-- **Data Quality:** {analysis_stage.get('data_quality_score', 0):.1%}
-- **Innovation Potential:** {innovation_stage.get('breakthrough_potential', 0):.1%}
-
----
-*Powered by Real Data APIs & Google Gemini AI - Production Research Intelligence*
-        """.strip()
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+        _live_ecosystems.discard(self)
+    
+    def build_report(self, results: Dict[str, Any]) -> ReportView:
+        """Collect the report fields without rendering them"""
+        return ReportView.from_results(results)
+    
+    def generate_report(self, results: Dict[str, Any]) -> str:
+        """Generate comprehensive report"""
+        return self.build_report(results).render_markdown()
 
 def main():
     """Main function for production system"""
@@ -8,98 +8,293 @@ import sqlite3
 import json
 import os
 import time
-from datetime import datetime
+import threading
+from datetime import datetime, timedelta
 from typing import Dict, Any
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 
-# Import your ecosystem
-try:
-    from final import AdaptiveResearchEcosystem, ResearchTask
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
-
-try:
-    from final_production import ProductionEcosystem, ResearchTask
-    PRODUCTION_AVAILABLE = True
-except ImportError:
-    PRODUCTION_AVAILABLE = False
+DB_PATH = 'ecosystem_data.db'
 
 # Database setup
+@st.cache_resource
+def get_db() -> sqlite3.Connection:
+    """Open the app's SQLite connection once per process; Streamlit reruns and sessions share it"""
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False, isolation_level=None)
+    conn.executescript("""
+        PRAGMA journal_mode=WAL;
+        PRAGMA synchronous=NORMAL;
+        PRAGMA cache_size=-65536;
+        PRAGMA mmap_size=268435456;
+    """)
+    return conn
+
+@st.cache_resource
+def get_db_lock() -> threading.Lock:
+    """Serialises use of the shared connection across session threads"""
+    return threading.Lock()
+
+@st.cache_resource
 def init_database():
-    """Initialize SQLite database for logging and memory"""
-    conn = sqlite3.connect('ecosystem_data.db')
-    cursor = conn.cursor()
+    """Initialize SQLite database for logging and memory (once per process, not on every rerun)"""
+    with get_db_lock():
+        get_db().executescript('''
+            CREATE TABLE IF NOT EXISTS tasks (
+                id TEXT PRIMARY KEY,
+                title TEXT,
+                description TEXT,
+                status TEXT,
+                created_at TIMESTAMP,
+                completed_at TIMESTAMP,
+                processing_time REAL,
+                success_rate REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_tasks_created_at ON tasks(created_at DESC);
+            
+            CREATE TABLE IF NOT EXISTS agent_performance (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                agent_id TEXT,
+                task_id TEXT,
+                performance_score REAL,
+                confidence_score REAL,
+                timestamp TIMESTAMP
+            );
+        ''')
+        # research_results belongs to ProductionEcosystem (RESEARCH_RESULTS_SCHEMA); the page never reads it
+
+TASK_COLUMNS = ('id', 'title', 'description', 'status', 'created_at', 'completed_at', 'processing_time', 'success_rate')
+
+INSERT_TASK_SQL = f'''
+    INSERT OR REPLACE INTO tasks 
+    ({', '.join(TASK_COLUMNS)})
+    VALUES ({', '.join('?' * len(TASK_COLUMNS))})
+'''
+
+def save_task_to_db(task_data):
+    """Save task data to database"""
+    with get_db_lock():
+        get_db().execute(INSERT_TASK_SQL, tuple(task_data.get(column) for column in TASK_COLUMNS))
+    get_task_history.clear()
+
+def save_tasks_bulk(tasks):
+    """Save many task dicts with one prepared statement in a single transaction"""
+    rows = [tuple(task_data.get(column) for column in TASK_COLUMNS) for task_data in tasks]
+    with get_db_lock():
+        conn = get_db()
+        # the connection autocommits, so group the batch explicitly
+        conn.execute('BEGIN')
+        try:
+            conn.executemany(INSERT_TASK_SQL, rows)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+    get_task_history.clear()
+
+@st.cache_data(ttl=10, show_spinner=False)
+def get_task_history():
+    """Get task history from database"""
+    with get_db_lock():
+        return pd.read_sql_query("SELECT * FROM tasks ORDER BY created_at DESC", get_db())
+
+def get_task_history_delta(since):
+    """Get tasks created after since (e.g. by another process while the cached history is still fresh)"""
+    with get_db_lock():
+        return pd.read_sql_query("SELECT * FROM tasks WHERE created_at > ? ORDER BY created_at DESC", get_db(), params=(since,))
+
+def get_task_metrics(since: datetime):
+    """Dashboard aggregates in one query: (total, success rate %, avg processing time, tasks created after since)"""
+    with get_db_lock():
+        return get_db().execute('''
+            SELECT
+                COUNT(*),
+                COALESCE(AVG(CASE WHEN status = 'completed' THEN 1.0 ELSE 0.0 END) * 100, 0),
+                COALESCE(AVG(processing_time), 0),
+                COALESCE(SUM(created_at > ?), 0)
+            FROM tasks
+        ''', (since,)).fetchone()
+
+def load_task_history():
+    """Cached task history topped up with any newer rows"""
+    task_history = get_task_history()
+    if len(task_history) == 0:
+        return task_history
     
-    # Create tables
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS tasks (
-            id TEXT PRIMARY KEY,
-            title TEXT,
-            description TEXT,
-            status TEXT,
-            created_at TIMESTAMP,
-            completed_at TIMESTAMP,
-            processing_time REAL,
-            success_rate REAL
-        )
-    ''')
+    delta = get_task_history_delta(task_history['created_at'].max())
+    if len(delta) == 0:
+        return task_history
+    return pd.concat([delta, task_history], ignore_index=True).drop_duplicates('id')
+
+# Plotly figures are rebuilt only when the task history frame changes
+
+@st.cache_data(show_spinner=False)
+def build_time_fig(task_history: pd.DataFrame):
+    """Processing time trend"""
+    return px.line(
+        task_history, 
+        x='created_at', 
+        y='processing_time',
+        title='Processing Time Trend',
+        labels={'processing_time': 'Time (seconds)', 'created_at': 'Date'}
+    )
+
+@st.cache_data(show_spinner=False)
+def build_success_fig(task_history: pd.DataFrame):
+    """Task success distribution"""
+    success_counts = task_history['status'].value_counts()
+    return px.pie(
+        values=success_counts.values,
+        names=success_counts.index,
+        title='Task Success Distribution'
+    )
+
+# the ecosystems are imported when a task is launched rather than at module load,
+# so reruns that never launch one (dashboard, history) skip the whole agent stack
+def create_ecosystem(selected_llm: str):
+    """Build the ecosystem for the selected provider; returns (ecosystem, provider), or (None, None)"""
+    if selected_llm == "OpenAI GPT-4":
+        try:
+            from final import AdaptiveResearchEcosystem
+            return AdaptiveResearchEcosystem(), "OpenAI"
+        except ImportError:
+            pass
     
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS agent_performance (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            agent_id TEXT,
-            task_id TEXT,
-            performance_score REAL,
-            confidence_score REAL,
-            timestamp TIMESTAMP
-        )
-    ''')
+    try:
+        from final_production import ProductionEcosystem
+        return ProductionEcosystem(), "Google Gemini (Production)"
+    except ImportError:
+        return None, None
+
+def get_worker():
+    """The worker module when workflows should go to Celery (see worker.py), else None"""
+    if not os.getenv('CELERY_BROKER_URL'):
+        return None
+    try:
+        import worker
+    except ImportError:
+        return None
+    return worker
+
+# how each workflow stage is shown: container title, expander label, result field, fallback text,
+# then the status shown while the stage is running
+STAGE_VIEWS = {
+    'research': ("🔍 Research Stage Complete", "📊 Research Findings", 'research_data', 'No data',
+                 "🔍 Stage 1: Research Agent gathering data..."),
+    'analysis': ("📊 Analysis Stage Complete", "🧠 Analysis Insights", 'analysis_insights', 'No insights',
+                 "📊 Stage 2: Analysis Agent processing patterns..."),
+    'innovation': ("💡 Innovation Stage Complete", "🚀 Innovation Opportunities", 'innovation_ideas', 'No ideas',
+                   "💡 Stage 3: Innovation Agent generating ideas..."),
+    'environment': ("🎛️ Environment Stage Complete", "⚙️ System Recommendations", 'management_recommendations', 'No recommendations',
+                    "🎛️ Stage 4: Environment Agent coordinating...")
+}
+
+def stage_progress():
+    """Lay out the live progress widgets; returns show_stage(stage, result) for each finished stage"""
+    st.subheader("🔄 Live Execution Progress")
+    
+    progress_bar = st.progress(0)
+    status_text = st.empty()
+    status_text.text(STAGE_VIEWS['research'][-1])
     
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS research_results (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            task_id TEXT,
-            agent_id TEXT,
-            result_data TEXT,
-            timestamp TIMESTAMP
-        )
-    ''')
+    # Stage containers, laid out in workflow order whatever order the stages finish in
+    stage_containers = {stage: st.container() for stage in STAGE_VIEWS}
+    finished_stages = []
+    
+    def show_stage(stage, stage_result):
+        """Render one finished stage; progress counts finished stages, so it only moves forward
+        whichever of analysis and innovation finishes first"""
+        done_label, expander_label, field, fallback, _ = STAGE_VIEWS[stage]
+        with stage_containers[stage]:
+            st.success(done_label)
+            with st.expander(expander_label, expanded=True):
+                st.markdown(stage_result.get(field, fallback))
+        
+        finished_stages.append(stage)
+        progress_bar.progress(len(finished_stages) * 100 // len(STAGE_VIEWS))
+        pending = [STAGE_VIEWS[s][-1] for s in STAGE_VIEWS if s not in finished_stages]
+        status_text.text(f"{len(finished_stages)} of {len(STAGE_VIEWS)} stages complete"
+                         + (f" · {pending[0]}" if pending else ""))
     
-    conn.commit()
-    conn.close()
+    return show_stage
 
-def save_task_to_db(task_data):
-    """Save task data to database"""
-    conn = sqlite3.connect('ecosystem_data.db')
-    cursor = conn.cursor()
+def record_outcome(task_id: str, title: str, description: str, results: Dict[str, Any], processing_time: float) -> bool:
+    """Report and save a finished workflow; returns False when it failed
     
-    cursor.execute('''
-        INSERT OR REPLACE INTO tasks 
-        (id, title, description, status, created_at, completed_at, processing_time, success_rate)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (
-        task_data.get('id'),
-        task_data.get('title'),
-        task_data.get('description'),
-        task_data.get('status'),
-        task_data.get('created_at'),
-        task_data.get('completed_at'),
-        task_data.get('processing_time'),
-        task_data.get('success_rate')
-    ))
+    Workflows report failures in the results rather than raising, so the error key decides.
+    """
+    failed = bool(results.get('error'))
+    if failed:
+        st.error(f"❌ Error during execution: {results['error']}")
+    else:
+        st.balloons()
+        st.success(f"🎉 Research task completed successfully in {processing_time:.2f} seconds!")
     
-    conn.commit()
-    conn.close()
+    # Save to database
+    save_task_to_db({
+        'id': task_id,
+        'title': title,
+        'description': description,
+        'status': 'failed' if failed else 'completed',
+        'created_at': datetime.now(),
+        'completed_at': datetime.now(),
+        'processing_time': processing_time,
+        'success_rate': 0.0 if failed else 1.0
+    })
+    return not failed
 
-def get_task_history():
-    """Get task history from database"""
-    conn = sqlite3.connect('ecosystem_data.db')
-    df = pd.read_sql_query("SELECT * FROM tasks ORDER BY created_at DESC", conn)
-    conn.close()
-    return df
+def show_report(report, task_id: str):
+    """Render a ReportView's summary, with the full markdown as a download"""
+    # the stage texts are already on the page above, so only the summary
+    # and metrics are rendered here
+    st.markdown(report.render_summary_markdown())
+    st.download_button(
+        label="📥 Download Full Report",
+        data=report.render_markdown(),
+        file_name=f"research_report_{task_id}.md",
+        mime="text/markdown"
+    )
+
+@st.fragment(run_every=2)
+def poll_celery_workflow():
+    """Render the session's running Celery workflow; reruns on its own every 2 seconds, not the whole page"""
+    job = st.session_state['celery_job']
+    async_result = get_worker().celery_app.AsyncResult(job['celery_id'])
+    
+    if async_result.ready():
+        try:
+            job['results'] = async_result.get()
+        except Exception as e:
+            # the worker gave up after its retries
+            job['results'] = {'error': str(e)}
+        st.rerun()  # the whole page, which shows the outcome and stops this polling
+    
+    show_stage = stage_progress()
+    stages = async_result.info.get('stages', {}) if async_result.state == 'PROGRESS' else {}
+    for stage in STAGE_VIEWS:
+        if stage in stages:
+            show_stage(stage, stages[stage])
+
+def show_celery_outcome(job: Dict[str, Any]):
+    """Render a finished Celery workflow, recording it the first time it is shown"""
+    results = job['results']
+    if not results.get('error'):
+        show_stage = stage_progress()
+        stages = results.get('stages', {})
+        for stage in STAGE_VIEWS:
+            show_stage(stage, stages.get(stage, {}))
+    
+    task = job['task']
+    if not job.get('recorded'):
+        job['recorded'] = True
+        record_outcome(task['id'], task['title'], task['description'], results, time.time() - job['started_at'])
+    elif results.get('error'):
+        st.error(f"❌ Error during execution: {results['error']}")
+    
+    if not results.get('error'):
+        from final_production import ReportView
+        st.subheader("📋 Comprehensive Research Report")
+        show_report(ReportView.from_results(results), task['id'])
 
 def main():
     """Main Streamlit app"""
@@ -188,129 +383,88 @@ def main():
         
         if st.button("🚀 Launch Research Task", type="primary"):
             if task_title and task_description:
-                with st.spinner("🔄 Initializing research ecosystem..."):
-                    
-                    # Initialize appropriate ecosystem
-                    if selected_llm == "OpenAI GPT-4" and OPENAI_AVAILABLE:
-                        ecosystem = AdaptiveResearchEcosystem()
-                        provider = "OpenAI"
-                    elif PRODUCTION_AVAILABLE:
-                        # Use production system with Google Gemini
-                        ecosystem = ProductionEcosystem()
-                        provider = "Google Gemini (Production)"
-                    else:
-                        st.error("❌ No LLM providers available. Please configure API keys in .env file.")
-                        st.stop()
-                    
-                    # Create task
-                    if selected_llm == "OpenAI GPT-4" and OPENAI_AVAILABLE:
-                        task = ecosystem.create_research_task(
-                            title=task_title,
-                            description=task_description,
-                            priority=priority
-                        )
-                    else:
-                        # Production system uses different method
-                        task = ecosystem.create_task(
-                            title=task_title,
-                            description=task_description
-                        )
-                    
-                    st.success(f"✅ Task created with {provider} LLM")
-                
-                # Execute workflow with real-time updates
-                st.subheader("🔄 Live Execution Progress")
-                
-                progress_bar = st.progress(0)
-                status_text = st.empty()
-                
-                # Stage containers
-                research_container = st.container()
-                analysis_container = st.container()
-                innovation_container = st.container()
-                environment_container = st.container()
-                
-                try:
-                    # Execute workflow
-                    start_time = time.time()
-                    
-                    # Stage 1: Research
-                    status_text.text("🔍 Stage 1: Research Agent gathering data...")
-                    progress_bar.progress(25)
-                    
-                    if selected_llm == "OpenAI GPT-4" and OPENAI_AVAILABLE:
-                        results = ecosystem.execute_research_workflow(task)
-                    else:
-                        # Production system uses different method
-                        results = ecosystem.execute_workflow(task)
-                    
-                    # Display results in real-time
-                    with research_container:
-                        st.success("🔍 Research Stage Complete")
-                        with st.expander("📊 Research Findings", expanded=True):
-                            research_data = results.get('stages', {}).get('research', {}).get('research_data', 'No data')
-                            st.markdown(research_data)
+                st.session_state.pop('celery_job', None)
+                # with a Celery worker configured the production workflow runs there, and this
+                # process only enqueues it: no ecosystem, agents or Gemini client are built here
+                worker = get_worker() if selected_llm != "OpenAI GPT-4" else None
+                if worker is not None:
+                    # the handler returns at once; poll_celery_workflow renders the stages as the worker reports them
+                    payload = worker.make_task(task_title, task_description, priority)
+                    try:
+                        async_result = worker.run_workflow_task.delay(payload)
+                        st.session_state['celery_job'] = {
+                            'celery_id': async_result.id,
+                            'task': payload,
+                            'started_at': time.time()
+                        }
+                        st.success(f"✅ Task {payload['id']} queued for a Celery worker")
+                    except Exception as e:
+                        st.error(f"❌ Error during execution: {str(e)}")
+                else:
+                    with st.spinner("🔄 Initializing research ecosystem..."):
+                        
+                        # Initialize appropriate ecosystem (the production system uses Google Gemini)
+                        ecosystem, provider = create_ecosystem(selected_llm)
+                        if ecosystem is None:
+                            st.error("❌ No LLM providers available. Please configure API keys in .env file.")
+                            st.stop()
+                        use_openai = provider == "OpenAI"
+                        
+                        # Create task
+                        if use_openai:
+                            task = ecosystem.create_research_task(
+                                title=task_title,
+                                description=task_description,
+                                priority=priority
+                            )
+                        else:
+                            # Production system uses different method
+                            task = ecosystem.create_task(
+                                title=task_title,
+                                description=task_description
+                            )
+                        
+                        st.success(f"✅ Task created with {provider} LLM")
                     
-                    progress_bar.progress(50)
-                    status_text.text("📊 Stage 2: Analysis Agent processing patterns...")
+                    # Execute workflow with real-time updates
+                    show_stage = stage_progress()
                     
-                    with analysis_container:
-                        st.success("📊 Analysis Stage Complete")
-                        with st.expander("🧠 Analysis Insights", expanded=True):
-                            analysis_data = results.get('stages', {}).get('analysis', {}).get('analysis_insights', 'No insights')
-                            st.markdown(analysis_data)
-                    
-                    progress_bar.progress(75)
-                    status_text.text("💡 Stage 3: Innovation Agent generating ideas...")
-                    
-                    with innovation_container:
-                        st.success("💡 Innovation Stage Complete")
-                        with st.expander("🚀 Innovation Opportunities", expanded=True):
-                            innovation_data = results.get('stages', {}).get('innovation', {}).get('innovation_ideas', 'No ideas')
-                            st.markdown(innovation_data)
-                    
-                    progress_bar.progress(100)
-                    status_text.text("🎛️ Stage 4: Environment Agent coordinating...")
-                    
-                    with environment_container:
-                        st.success("🎛️ Environment Stage Complete")
-                        with st.expander("⚙️ System Recommendations", expanded=True):
-                            env_data = results.get('stages', {}).get('environment', {}).get('management_recommendations', 'No recommendations')
-                            st.markdown(env_data)
-                    
-                    # Final results
-                    processing_time = time.time() - start_time
-                    
-                    st.balloons()
-                    st.success(f"🎉 Research task completed successfully in {processing_time:.2f} seconds!")
-                    
-                    # Save to database
-                    task_data = {
-                        'id': task.id,
-                        'title': task.title,
-                        'description': task.description,
-                        'status': 'completed',
-                        'created_at': datetime.now(),
-                        'completed_at': datetime.now(),
-                        'processing_time': processing_time,
-                        'success_rate': 1.0
-                    }
-                    save_task_to_db(task_data)
-                    
-                    # Display comprehensive report
-                    st.subheader("📋 Comprehensive Research Report")
-                    if selected_llm == "OpenAI GPT-4" and OPENAI_AVAILABLE:
-                        report = ecosystem.generate_comprehensive_report(results)
-                    else:
-                        # Production system uses different method
-                        report = ecosystem.generate_report(results)
-                    st.markdown(report)
-                    
-                except Exception as e:
-                    st.error(f"❌ Error during execution: {str(e)}")
+                    try:
+                        # Execute workflow
+                        start_time = time.time()
+                        
+                        if use_openai:
+                            results = ecosystem.execute_research_workflow(task)
+                            stages = results.get('stages', {})
+                            for stage in STAGE_VIEWS:
+                                show_stage(stage, stages.get(stage, {}))
+                        else:
+                            # Production system renders each stage as soon as it finishes
+                            results = ecosystem.execute_workflow(task, on_stage=show_stage)
+                        
+                        # Final results
+                        if record_outcome(task.id, task.title, task.description, results, time.time() - start_time):
+                            # Display comprehensive report
+                            st.subheader("📋 Comprehensive Research Report")
+                            if use_openai:
+                                report = ecosystem.generate_comprehensive_report(results)
+                                st.markdown(report)
+                            else:
+                                show_report(ecosystem.build_report(results), task.id)
+                        
+                    except Exception as e:
+                        st.error(f"❌ Error during execution: {str(e)}")
                     
             else:
                 st.warning("⚠️ Please provide both title and description")
+        
+        # a workflow handed to Celery is shown on every rerun until the next launch
+        job = st.session_state.get('celery_job')
+        if job is not None:
+            if 'results' in job:
+                show_celery_outcome(job)
+            else:
+                poll_celery_workflow()
     
     # Tab 2: System Dashboard
     with tab2:
@@ -318,22 +472,21 @@ def main():
         
         col1, col2, col3, col4 = st.columns(4)
         
-        # Get task history for metrics
-        task_history = get_task_history()
+        # Metrics are aggregated in SQL; the full history is only loaded for the charts and table
+        total_tasks, success_rate, avg_time, recent_tasks = get_task_metrics(datetime.now() - timedelta(days=1))
+        task_history = load_task_history()
         
         with col1:
             st.metric(
                 "📋 Total Tasks",
-                len(task_history),
-                delta=f"+{len(task_history[task_history['created_at'] > (datetime.now() - pd.Timedelta(days=1)).isoformat()])}" if len(task_history) > 0 else None
+                total_tasks,
+                delta=f"+{recent_tasks}" if total_tasks > 0 else None
             )
         
         with col2:
-            success_rate = (task_history['status'] == 'completed').mean() * 100 if len(task_history) > 0 else 0
             st.metric("✅ Success Rate", f"{success_rate:.1f}%")
         
         with col3:
-            avg_time = task_history['processing_time'].mean() if len(task_history) > 0 else 0
             st.metric("⏱️ Avg Processing Time", f"{avg_time:.2f}s")
         
         with col4:
@@ -362,23 +515,10 @@ def main():
         
         if len(task_history) > 0:
             # Processing time trend
-            fig_time = px.line(
-                task_history, 
-                x='created_at', 
-                y='processing_time',
-                title='Processing Time Trend',
-                labels={'processing_time': 'Time (seconds)', 'created_at': 'Date'}
-            )
-            st.plotly_chart(fig_time, use_container_width=True)
+            st.plotly_chart(build_time_fig(task_history), use_container_width=True)
             
             # Success rate pie chart
-            success_counts = task_history['status'].value_counts()
-            fig_success = px.pie(
-                values=success_counts.values,
-                names=success_counts.index,
-                title='Task Success Distribution'
-            )
-            st.plotly_chart(fig_success, use_container_width=True)
+            st.plotly_chart(build_success_fig(task_history), use_container_width=True)
             
         else:
             st.info("📊 No performance data available yet. Execute some tasks to see analytics!")
@@ -404,6 +544,18 @@ def main():
                 )
         else:
             st.info("📝 No task history available yet.")
+        
+        # Import functionality (accepts files produced by the export above)
+        uploaded_history = st.file_uploader("📤 Import Task History", type="csv")
+        if uploaded_history is not None and st.button("Import CSV"):
+            imported = pd.read_csv(uploaded_history)
+            missing = [column for column in ('id', 'title') if column not in imported.columns]
+            if missing:
+                st.error(f"❌ CSV is missing required columns: {', '.join(missing)}")
+            else:
+                tasks = imported.astype(object).where(imported.notna(), None).to_dict('records')
+                save_tasks_bulk(tasks)
+                st.success(f"✅ Imported {len(tasks)} tasks")
     
  
 
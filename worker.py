@@ -0,0 +1,73 @@
+"""
+Celery worker for the Gen AI Adaptive Research & Innovation Agent Ecosystem
+Runs research workflows outside the Streamlit process
+
+Start a worker with:  celery -A worker worker --loglevel=info
+"""
+
+import os
+import time
+from typing import Dict, Any
+
+import orjson
+from celery import Celery
+from dotenv import load_dotenv
+
+load_dotenv()
+
+BROKER_URL = os.getenv('CELERY_BROKER_URL', 'redis://localhost:6379/0')
+
+celery_app = Celery(
+    'research_ecosystem',
+    broker=BROKER_URL,
+    backend=os.getenv('CELERY_RESULT_BACKEND', BROKER_URL)
+)
+celery_app.conf.update(
+    task_track_started=True,
+    worker_prefetch_multiplier=1,  # workflows run for minutes, don't let one worker hoard them
+    task_acks_late=True
+)
+
+# final_production is imported inside the task code, not at module load: the Streamlit page
+# imports this module only to enqueue workflows and must not pull in the agent stack
+_ecosystem = None
+
+def get_ecosystem():
+    """One ecosystem (agents, Gemini client, DB connection) per worker process"""
+    global _ecosystem
+    if _ecosystem is None:
+        from final_production import ProductionEcosystem
+        _ecosystem = ProductionEcosystem()
+    return _ecosystem
+
+def make_task(title: str, description: str, priority: int = 1) -> Dict[str, Any]:
+    """JSON-safe arguments for run_workflow_task, with the same id scheme as ProductionEcosystem.create_task"""
+    return {
+        'id': f"task_{int(time.time())}",
+        'title': title,
+        'description': description,
+        'priority': priority
+    }
+
+def _to_plain(data: Any) -> Any:
+    """Flatten AgentResult objects so results can go through the JSON result backend"""
+    from final_production import dump_results
+    return orjson.loads(dump_results(data))
+
+@celery_app.task(bind=True, max_retries=3)
+def run_workflow_task(self, task_dict: Dict[str, Any]) -> Dict[str, Any]:
+    """Execute the full workflow, publishing each finished stage as PROGRESS state"""
+    from final_production import ResearchTask
+    task = ResearchTask(**task_dict)
+    finished_stages = {}
+    
+    def report_stage(stage: str, stage_result):
+        finished_stages[stage] = _to_plain(stage_result)
+        self.update_state(state='PROGRESS', meta={'stages': finished_stages})
+    
+    # execute_workflow reports failures in the results rather than raising
+    results = get_ecosystem().execute_workflow(task, on_stage=report_stage)
+    if results.get('error'):
+        raise self.retry(exc=RuntimeError(results['error']), countdown=2 ** self.request.retries)
+    
+    return _to_plain(results)